@@ -5,7 +5,8 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+import asyncio
 
 
 class ErrorType(str, Enum):
@@ -69,6 +70,16 @@ class ValidationResult(BaseModel):
     def add_warning(self, warning: str):
         """Add a warning message."""
         self.warnings.append(warning)
+    
+    def add_errors(self, errors: List[str]):
+        """Add several error messages at once."""
+        if errors:
+            self.errors.extend(errors)
+            self.is_valid = False
+    
+    def add_warnings(self, warnings: List[str]):
+        """Add several warning messages at once."""
+        self.warnings.extend(warnings)
 
 
 class AgentInput(BaseModel):
@@ -103,6 +114,7 @@ class AgentContext(BaseModel):
     retry_count: int = 0
     max_retries: int = 3
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    _background_tasks: List[asyncio.Task] = PrivateAttr(default_factory=list)
     
     def add_output(self, agent_name: str, output: Any):
         """Add agent output to context."""
@@ -119,6 +131,16 @@ class AgentContext(BaseModel):
     def can_retry(self) -> bool:
         """Check if retry is allowed."""
         return self.retry_count < self.max_retries
+    
+    def add_background_task(self, task: asyncio.Task):
+        """Register work that may outlive an agent call but must finish before the workflow ends."""
+        self._background_tasks.append(task)
+    
+    async def wait_for_background_tasks(self):
+        """Wait for registered background tasks; cancelling the wait does not cancel them."""
+        if self._background_tasks:
+            tasks, self._background_tasks = self._background_tasks, []
+            await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
 
 
 class AgentMetrics(BaseModel):
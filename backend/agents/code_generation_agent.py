@@ -9,12 +9,14 @@ This agent:
 - Checks for Tailwind CSS CDN inclusion
 - Calculates confidence scores for generated code
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, ClassVar
 from datetime import datetime
+from functools import lru_cache, cached_property
 from pydantic import BaseModel, Field
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
 import difflib
+from collections import Counter
 
 from agents.base_agent import (
     BaseAgent,
@@ -26,13 +28,81 @@ from agents.base_agent import (
     ErrorType,
 )
 from agents.templates import template_library, SiteTemplate
-from agents.design_styles import design_style_library, DesignStyle
+from agents.design_styles import get_design_style_library, DesignStyleLibrary
 from agents.ui_libraries import ui_library_registry, UILibrary
 from agents.package_research_agent import package_research_agent, PackageResearchInput
 from services.gemini_service import gemini_service
 from utils.logging import logger
 
 
+@lru_cache(maxsize=16)
+def _parse_html(code: str) -> LexborHTMLParser:
+    """
+    Parse HTML with the Lexbor C parser, reusing the tree when the same
+    code is validated again.
+    
+    The returned tree is shared and must be treated as read-only.
+    """
+    return LexborHTMLParser(code)
+
+
+# The parser synthesizes a missing <html> root, so structural presence is checked on the source
+_HTML_TAG_RE = re.compile(r'<html\b', re.IGNORECASE)
+
+# Head-level tags checked by _validate_vanilla_code without building a tree
+_TITLE_TAG_RE = re.compile(r'<title\b', re.IGNORECASE)
+_DESCRIPTION_META_RE = re.compile(
+    r'<meta\b[^>]*\bname\s*=\s*(?:"description"|\'description\'|description(?=[\s/>]))',
+    re.IGNORECASE,
+)
+_VIEWPORT_META_RE = re.compile(
+    r'<meta\b[^>]*\bname\s*=\s*(?:"viewport"|\'viewport\'|viewport(?=[\s/>]))',
+    re.IGNORECASE,
+)
+_TAILWIND_SCRIPT_RE = re.compile(r'<script\b[^>]*\bsrc\s*=[^>]*tailwindcss', re.IGNORECASE)
+
+# Tailwind breakpoints, CSS media queries and responsive layout systems
+_RESPONSIVE_RE = re.compile(r'sm:|md:|lg:|xl:|2xl:|@media|flex|grid')
+
+# Page-level features that modifications must not drop
+_PRESERVED_MARKERS_RE = re.compile(r'<!DOCTYPE|tailwindcss')
+
+# Preview limits for CodeDiff.modified_sections
+_MAX_DIFF_SECTIONS = 5
+_MAX_DIFF_SECTION_LINES = 10
+
+# Opening tags counted by _validate_modifications
+_MODIFICATION_TAG_RE = re.compile(r'<(meta|section|article|div|form|nav)\b', re.IGNORECASE)
+
+
+class _CodeContext:
+    """Derived forms of one code string, each computed at most once on first use."""
+    
+    def __init__(self, code: str):
+        self.code = code
+    
+    @cached_property
+    def lines(self) -> List[str]:
+        """Lines without line endings, as compared by _generate_diff."""
+        return self.code.splitlines()
+    
+    @cached_property
+    def markers(self) -> frozenset:
+        """DOCTYPE / Tailwind markers present in the code."""
+        return frozenset(_PRESERVED_MARKERS_RE.findall(self.code))
+    
+    @cached_property
+    def tag_counts(self) -> Counter:
+        """Opening tag counts of the elements tracked by _validate_modifications."""
+        return Counter(tag.lower() for tag in _MODIFICATION_TAG_RE.findall(self.code))
+
+
+@lru_cache(maxsize=16)
+def _code_context(code: str) -> _CodeContext:
+    """Return the shared context for code, so diffing and modification checks reuse it."""
+    return _CodeContext(code)
+
+
 # Input Models
 class CodeGenerationInput(AgentInput):
     """Input for code generation."""
@@ -59,6 +129,15 @@ class CodeMetadata(BaseModel):
 
 class CodeValidation(BaseModel):
     """Validation results for generated code."""
+    # Bit flags mirroring the boolean checks, used by validators to accumulate
+    # results before building the model once
+    FLAG_HTML: ClassVar[int] = 1
+    FLAG_TITLE: ClassVar[int] = 2
+    FLAG_DESCRIPTION: ClassVar[int] = 4
+    FLAG_VIEWPORT: ClassVar[int] = 8
+    FLAG_TAILWIND: ClassVar[int] = 16
+    FLAG_RESPONSIVE: ClassVar[int] = 32
+    
     is_valid_html: bool = True
     has_title: bool = False
     has_description: bool = False
@@ -68,6 +147,79 @@ class CodeValidation(BaseModel):
     validation_errors: List[str] = Field(default_factory=list)
     validation_warnings: List[str] = Field(default_factory=list)
     confidence_score: float = Field(default=0.0, ge=0.0, le=1.0)
+    
+    @property
+    def flags(self) -> int:
+        """Boolean checks packed into a FLAG_* bitmask."""
+        return (
+            self.FLAG_HTML * self.is_valid_html
+            | self.FLAG_TITLE * self.has_title
+            | self.FLAG_DESCRIPTION * self.has_description
+            | self.FLAG_VIEWPORT * self.has_viewport
+            | self.FLAG_TAILWIND * self.has_tailwind_cdn
+            | self.FLAG_RESPONSIVE * self.has_responsive_patterns
+        )
+    
+    @classmethod
+    def from_flags(
+        cls,
+        flags: int,
+        validation_errors: Optional[List[str]] = None,
+        validation_warnings: Optional[List[str]] = None,
+        confidence_score: Optional[float] = None,
+    ) -> "CodeValidation":
+        """Build a validation result from a FLAG_* bitmask, scoring it unless a score is given."""
+        return cls(
+            is_valid_html=bool(flags & cls.FLAG_HTML),
+            has_title=bool(flags & cls.FLAG_TITLE),
+            has_description=bool(flags & cls.FLAG_DESCRIPTION),
+            has_viewport=bool(flags & cls.FLAG_VIEWPORT),
+            has_tailwind_cdn=bool(flags & cls.FLAG_TAILWIND),
+            has_responsive_patterns=bool(flags & cls.FLAG_RESPONSIVE),
+            validation_errors=validation_errors or [],
+            validation_warnings=validation_warnings or [],
+            confidence_score=(
+                _CONFIDENCE_BY_FLAGS[flags] if confidence_score is None else confidence_score
+            ),
+        )
+
+
+# Confidence weights per check: valid HTML structure (most important) 2.0,
+# title 1.0, description 0.5, viewport 0.5, Tailwind CSS 1.0, responsive design 1.0
+_CONFIDENCE_WEIGHTS = (
+    (CodeValidation.FLAG_HTML, 2.0),
+    (CodeValidation.FLAG_TITLE, 1.0),
+    (CodeValidation.FLAG_DESCRIPTION, 0.5),
+    (CodeValidation.FLAG_VIEWPORT, 0.5),
+    (CodeValidation.FLAG_TAILWIND, 1.0),
+    (CodeValidation.FLAG_RESPONSIVE, 1.0),
+)
+
+# Confidence score for every flag combination, indexed by bitmask
+_CONFIDENCE_BY_FLAGS = tuple(
+    sum(weight for flag, weight in _CONFIDENCE_WEIGHTS if flags & flag) / 6.0
+    for flags in range(64)
+)
+
+# Head-level checks in _validate_vanilla_code: parser fallback selectors and warnings
+_HEAD_SELECTORS = (
+    (CodeValidation.FLAG_TITLE, 'title'),
+    (CodeValidation.FLAG_DESCRIPTION, 'meta[name="description"]'),
+    (CodeValidation.FLAG_VIEWPORT, 'meta[name="viewport"]'),
+    (CodeValidation.FLAG_TAILWIND, 'script[src*="tailwindcss"]'),
+)
+_HEAD_WARNINGS = (
+    (CodeValidation.FLAG_TITLE, "Missing <title> tag"),
+    (CodeValidation.FLAG_DESCRIPTION, "Missing description meta tag"),
+    (CodeValidation.FLAG_VIEWPORT, "Missing viewport meta tag"),
+    (CodeValidation.FLAG_TAILWIND, "Tailwind CSS CDN not found"),
+)
+_HEAD_FLAGS = (
+    CodeValidation.FLAG_TITLE
+    | CodeValidation.FLAG_DESCRIPTION
+    | CodeValidation.FLAG_VIEWPORT
+    | CodeValidation.FLAG_TAILWIND
+)
 
 
 class GeneratedCode(BaseModel):
@@ -111,11 +263,21 @@ class CodeGenerationAgent(BaseAgent):
         super().__init__(name="CodeGenerationAgent")
         self.gemini = gemini_service
         self.template_library = template_library  # For vanilla HTML only
-        self.design_style_library = design_style_library
         self.ui_library_registry = ui_library_registry  # Cache for common packages
         self.package_research_agent = package_research_agent  # Dynamic research
+        self._validators = {
+            "react": self._validate_react_code,
+            "vue": self._validate_vue_code,
+            "nextjs": self._validate_nextjs_code,
+            "svelte": self._validate_svelte_code,
+        }
         logger.info("Code Generation Agent initialized")
     
+    @property
+    def design_style_library(self) -> DesignStyleLibrary:
+        """Design style library, created on first use."""
+        return get_design_style_library()
+    
     async def _research_and_get_ui_library_info(
         self,
         ui_library: str,
@@ -1709,264 +1871,233 @@ Generate the COMPLETE modified HTML code, no explanations. The code should be re
     
     def _validate_code(self, html_code: str, framework: str = "vanilla") -> CodeValidation:
         """Validate generated code based on framework."""
-        if framework == "react":
-            return self._validate_react_code(html_code)
-        elif framework == "vue":
-            return self._validate_vue_code(html_code)
-        elif framework == "nextjs":
-            return self._validate_nextjs_code(html_code)
-        elif framework == "svelte":
-            return self._validate_svelte_code(html_code)
-        else:
-            return self._validate_vanilla_code(html_code)
+        validator = self._validators.get(framework, self._validate_vanilla_code)
+        return validator(html_code)
     
     def _validate_vanilla_code(self, html_code: str) -> CodeValidation:
         """Validate generated HTML code."""
-        validation = CodeValidation()
+        # Fail fast on truncated or partial output before running any other check
+        if not _HTML_TAG_RE.search(html_code):
+            return CodeValidation.from_flags(0, validation_errors=["Missing <html> tag"])
+        
+        flags = CodeValidation.FLAG_HTML
+        warnings = []
         
         try:
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_code, 'html.parser')
-            
-            # Check for valid HTML structure
-            if not soup.find('html'):
-                validation.is_valid_html = False
-                validation.validation_errors.append("Missing <html> tag")
-            
-            # Check for meta tags
-            title_tag = soup.find('title')
-            validation.has_title = title_tag is not None
-            if not validation.has_title:
-                validation.validation_warnings.append("Missing <title> tag")
-            
-            # Check for description meta tag
-            description_meta = soup.find('meta', attrs={'name': 'description'})
-            validation.has_description = description_meta is not None
-            if not validation.has_description:
-                validation.validation_warnings.append("Missing description meta tag")
-            
-            # Check for viewport meta tag
-            viewport_meta = soup.find('meta', attrs={'name': 'viewport'})
-            validation.has_viewport = viewport_meta is not None
-            if not validation.has_viewport:
-                validation.validation_warnings.append("Missing viewport meta tag")
-            
-            # Check for Tailwind CSS CDN
-            tailwind_script = soup.find('script', src=re.compile(r'tailwindcss'))
-            validation.has_tailwind_cdn = tailwind_script is not None
-            if not validation.has_tailwind_cdn:
-                validation.validation_warnings.append("Tailwind CSS CDN not found")
+            # Check head-level tags with regexes over the <head> region
+            # (bounded with endpos rather than slicing a copy of the head)
+            head_end = html_code.find('</head>')
+            if head_end == -1:
+                head_end = len(html_code)
+            if _TITLE_TAG_RE.search(html_code, 0, head_end):
+                flags |= CodeValidation.FLAG_TITLE
+            if _DESCRIPTION_META_RE.search(html_code, 0, head_end):
+                flags |= CodeValidation.FLAG_DESCRIPTION
+            if _VIEWPORT_META_RE.search(html_code, 0, head_end):
+                flags |= CodeValidation.FLAG_VIEWPORT
+            if _TAILWIND_SCRIPT_RE.search(html_code, 0, head_end):
+                flags |= CodeValidation.FLAG_TAILWIND
+            
+            # Confirm misses with the parser, which also covers tags placed
+            # outside <head> and unusual attribute quoting
+            if flags & _HEAD_FLAGS != _HEAD_FLAGS:
+                tree = _parse_html(html_code)
+                for flag, selector in _HEAD_SELECTORS:
+                    if not flags & flag and tree.css_first(selector) is not None:
+                        flags |= flag
+            
+            for flag, warning in _HEAD_WARNINGS:
+                if not flags & flag:
+                    warnings.append(warning)
             
             # Check for responsive design patterns
-            # Look for common responsive classes or media queries
-            html_str = str(soup)
-            responsive_indicators = [
-                'sm:', 'md:', 'lg:', 'xl:', '2xl:',  # Tailwind breakpoints
-                '@media',  # CSS media queries
-                'flex', 'grid',  # Responsive layout systems
-            ]
-            validation.has_responsive_patterns = any(
-                indicator in html_str for indicator in responsive_indicators
-            )
-            if not validation.has_responsive_patterns:
-                validation.validation_warnings.append("No responsive design patterns detected")
-            
-            # Calculate confidence score
-            validation.confidence_score = self._calculate_validation_confidence(validation)
+            # Look for common responsive classes or media queries in the source
+            if _RESPONSIVE_RE.search(html_code):
+                flags |= CodeValidation.FLAG_RESPONSIVE
+            else:
+                warnings.append("No responsive design patterns detected")
             
         except Exception as e:
             logger.error(f"Error validating HTML: {str(e)}")
-            validation.is_valid_html = False
-            validation.validation_errors.append(f"HTML parsing error: {str(e)}")
-            validation.confidence_score = 0.0
+            return CodeValidation.from_flags(
+                flags & ~CodeValidation.FLAG_HTML,
+                validation_errors=[f"HTML parsing error: {str(e)}"],
+                validation_warnings=warnings,
+                confidence_score=0.0,
+            )
         
-        return validation
+        return CodeValidation.from_flags(flags, validation_warnings=warnings)
     
     def _validate_react_code(self, code: str) -> CodeValidation:
         """Validate React code."""
-        validation = CodeValidation()
-        validation.is_valid_html = True  # React doesn't use HTML directly
+        flags = CodeValidation.FLAG_HTML  # React doesn't use HTML directly
+        warnings = []
         
         try:
             # Check for React imports
             if "import React" not in code and "import" in code:
-                validation.validation_warnings.append("React import may be missing")
+                warnings.append("React import may be missing")
             
             # Check for hooks usage
             if "useState" in code or "useEffect" in code or "useContext" in code:
-                validation.has_responsive_patterns = True
+                flags |= CodeValidation.FLAG_RESPONSIVE
             
             # Check for proper component structure
             if "function" in code or "const" in code and "=>" in code:
-                validation.has_title = True  # Using this field for component structure
+                flags |= CodeValidation.FLAG_TITLE  # Using this flag for component structure
             
             # Check for JSX syntax
             if "return (" in code or "return <" in code:
-                validation.has_description = True  # Using this field for JSX presence
+                flags |= CodeValidation.FLAG_DESCRIPTION  # Using this flag for JSX presence
             
             # Check for Tailwind classes
             if "className=" in code:
-                validation.has_tailwind_cdn = True
+                flags |= CodeValidation.FLAG_TAILWIND
             
             # Check for key props in lists
             if ".map(" in code and "key=" not in code:
-                validation.validation_warnings.append("Missing key props in list rendering")
-            
-            # Calculate confidence
-            validation.confidence_score = self._calculate_validation_confidence(validation)
+                warnings.append("Missing key props in list rendering")
             
         except Exception as e:
             logger.error(f"Error validating React code: {str(e)}")
-            validation.validation_errors.append(f"Validation error: {str(e)}")
+            return CodeValidation.from_flags(
+                flags,
+                validation_errors=[f"Validation error: {str(e)}"],
+                validation_warnings=warnings,
+                confidence_score=0.0,
+            )
         
-        return validation
+        return CodeValidation.from_flags(flags, validation_warnings=warnings)
     
     def _validate_vue_code(self, code: str) -> CodeValidation:
         """Validate Vue code."""
-        validation = CodeValidation()
-        validation.is_valid_html = True  # Vue uses SFC format
+        flags = CodeValidation.FLAG_HTML  # Vue uses SFC format
+        warnings = []
         
         try:
             # Check for Vue SFC structure
             if "<template>" in code and "<script" in code:
-                validation.has_title = True  # Using this field for SFC structure
+                flags |= CodeValidation.FLAG_TITLE  # Using this flag for SFC structure
             else:
-                validation.validation_warnings.append("Missing proper Vue SFC structure")
+                warnings.append("Missing proper Vue SFC structure")
             
             # Check for Composition API
             if "setup" in code or "ref" in code or "reactive" in code:
-                validation.has_responsive_patterns = True
+                flags |= CodeValidation.FLAG_RESPONSIVE
             
             # Check for Tailwind classes
             if "class=" in code:
-                validation.has_tailwind_cdn = True
+                flags |= CodeValidation.FLAG_TAILWIND
             
             # Check for v-for with key
             if "v-for=" in code and ":key=" not in code:
-                validation.validation_warnings.append("Missing :key binding in v-for")
+                warnings.append("Missing :key binding in v-for")
             
             # Check for proper imports
             if "import" in code:
-                validation.has_description = True  # Using this field for imports
-            
-            # Calculate confidence
-            validation.confidence_score = self._calculate_validation_confidence(validation)
+                flags |= CodeValidation.FLAG_DESCRIPTION  # Using this flag for imports
             
         except Exception as e:
             logger.error(f"Error validating Vue code: {str(e)}")
-            validation.validation_errors.append(f"Validation error: {str(e)}")
+            return CodeValidation.from_flags(
+                flags,
+                validation_errors=[f"Validation error: {str(e)}"],
+                validation_warnings=warnings,
+                confidence_score=0.0,
+            )
         
-        return validation
+        return CodeValidation.from_flags(flags, validation_warnings=warnings)
     
     def _validate_nextjs_code(self, code: str) -> CodeValidation:
         """Validate Next.js code."""
-        validation = CodeValidation()
-        validation.is_valid_html = True  # Next.js uses JSX
+        flags = CodeValidation.FLAG_HTML  # Next.js uses JSX
+        warnings = []
         
         try:
             # Check for proper Next.js structure
             if "export default" in code:
-                validation.has_title = True  # Using this field for export structure
+                flags |= CodeValidation.FLAG_TITLE  # Using this flag for export structure
             
             # Check for metadata (Next.js 14+)
             if "metadata" in code or "generateMetadata" in code:
-                validation.has_description = True  # Using this field for metadata
-                validation.has_viewport = True
+                # Using these flags for metadata
+                flags |= CodeValidation.FLAG_DESCRIPTION | CodeValidation.FLAG_VIEWPORT
             else:
-                validation.validation_warnings.append("Missing metadata for SEO")
+                warnings.append("Missing metadata for SEO")
             
             # Check for Server/Client components
             if "'use client'" in code or '"use client"' in code:
                 # Client component - should have interactivity
                 if "useState" not in code and "useEffect" not in code:
-                    validation.validation_warnings.append("Client component without hooks")
+                    warnings.append("Client component without hooks")
             
             # Check for Tailwind classes
             if "className=" in code:
-                validation.has_tailwind_cdn = True
+                flags |= CodeValidation.FLAG_TAILWIND
             
             # Check for Next.js Image component
             if "<img" in code and "next/image" not in code:
-                validation.validation_warnings.append("Consider using next/image for optimization")
+                warnings.append("Consider using next/image for optimization")
             
             # Check for responsive patterns
             if "md:" in code or "lg:" in code:
-                validation.has_responsive_patterns = True
-            
-            # Calculate confidence
-            validation.confidence_score = self._calculate_validation_confidence(validation)
+                flags |= CodeValidation.FLAG_RESPONSIVE
             
         except Exception as e:
             logger.error(f"Error validating Next.js code: {str(e)}")
-            validation.validation_errors.append(f"Validation error: {str(e)}")
+            return CodeValidation.from_flags(
+                flags,
+                validation_errors=[f"Validation error: {str(e)}"],
+                validation_warnings=warnings,
+                confidence_score=0.0,
+            )
         
-        return validation
+        return CodeValidation.from_flags(flags, validation_warnings=warnings)
     
     def _validate_svelte_code(self, code: str) -> CodeValidation:
         """Validate Svelte code."""
-        validation = CodeValidation()
-        validation.is_valid_html = True  # Svelte uses SFC format
+        flags = CodeValidation.FLAG_HTML  # Svelte uses SFC format
+        warnings = []
         
         try:
             # Check for Svelte component structure
             if "<script>" in code or "<script " in code:
-                validation.has_title = True  # Using this field for component structure
+                flags |= CodeValidation.FLAG_TITLE  # Using this flag for component structure
             
             # Check for reactive statements
             if "$:" in code:
-                validation.has_responsive_patterns = True
+                flags |= CodeValidation.FLAG_RESPONSIVE
             
             # Check for Tailwind classes
             if "class=" in code:
-                validation.has_tailwind_cdn = True
+                flags |= CodeValidation.FLAG_TAILWIND
             
             # Check for proper event handlers
             if "on:" in code:
-                validation.has_description = True  # Using this field for event handlers
+                flags |= CodeValidation.FLAG_DESCRIPTION  # Using this flag for event handlers
             
             # Check for each blocks with key
             if "{#each" in code and "(" not in code:
-                validation.validation_warnings.append("Consider using keyed each blocks")
+                warnings.append("Consider using keyed each blocks")
             
             # Check for stores
             if "$" in code and "writable" in code or "readable" in code:
-                validation.has_viewport = True  # Using this field for stores
-            
-            # Calculate confidence
-            validation.confidence_score = self._calculate_validation_confidence(validation)
+                flags |= CodeValidation.FLAG_VIEWPORT  # Using this flag for stores
             
         except Exception as e:
             logger.error(f"Error validating Svelte code: {str(e)}")
-            validation.validation_errors.append(f"Validation error: {str(e)}")
+            return CodeValidation.from_flags(
+                flags,
+                validation_errors=[f"Validation error: {str(e)}"],
+                validation_warnings=warnings,
+                confidence_score=0.0,
+            )
         
-        return validation
+        return CodeValidation.from_flags(flags, validation_warnings=warnings)
     
     def _calculate_validation_confidence(self, validation: CodeValidation) -> float:
         """Calculate confidence score based on validation results."""
-        score = 0.0
-        max_score = 6.0
-        
-        # Valid HTML structure (most important)
-        if validation.is_valid_html:
-            score += 2.0
-        
-        # Meta tags
-        if validation.has_title:
-            score += 1.0
-        if validation.has_description:
-            score += 0.5
-        if validation.has_viewport:
-            score += 0.5
-        
-        # Tailwind CSS
-        if validation.has_tailwind_cdn:
-            score += 1.0
-        
-        # Responsive design
-        if validation.has_responsive_patterns:
-            score += 1.0
-        
-        return score / max_score
+        return _CONFIDENCE_BY_FLAGS[validation.flags]
     
     def _calculate_confidence(self, validation: CodeValidation) -> float:
         """Calculate overall confidence score for generated code."""
@@ -1995,43 +2126,30 @@ Generate the COMPLETE modified HTML code, no explanations. The code should be re
             CodeDiff with diff information
         """
         try:
-            old_lines = old_code.splitlines(keepends=True)
-            new_lines = new_code.splitlines(keepends=True)
-            
-            # Generate unified diff
-            diff = list(difflib.unified_diff(
-                old_lines,
-                new_lines,
-                fromfile='original',
-                tofile='modified',
-                lineterm=''
-            ))
-            
-            # Count changes
-            added_lines = sum(1 for line in diff if line.startswith('+') and not line.startswith('+++'))
-            removed_lines = sum(1 for line in diff if line.startswith('-') and not line.startswith('---'))
-            
-            # Extract modified sections (context around changes)
+            old_lines = _code_context(old_code).lines
+            new_lines = _code_context(new_code).lines
+            
+            # Count changes from the matcher's opcodes and render only the
+            # first few changed regions, instead of formatting every diff line
+            added_lines = 0
+            removed_lines = 0
             modified_sections = []
-            current_section = []
-            in_change = False
-            
-            for line in diff:
-                if line.startswith('@@'):
-                    if current_section:
-                        modified_sections.append(''.join(current_section))
-                        current_section = []
-                    in_change = True
-                    current_section.append(line + '\n')
-                elif in_change:
-                    current_section.append(line + '\n')
-                    if len(current_section) > 10:  # Limit section size
-                        modified_sections.append(''.join(current_section))
-                        current_section = []
-                        in_change = False
-            
-            if current_section:
-                modified_sections.append(''.join(current_section))
+            
+            matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == 'equal':
+                    continue
+                removed_lines += i2 - i1
+                added_lines += j2 - j1
+                
+                if len(modified_sections) < _MAX_DIFF_SECTIONS:
+                    # Only slice out the lines that fit in the preview
+                    removed = old_lines[i1:min(i2, i1 + _MAX_DIFF_SECTION_LINES)]
+                    added = new_lines[j1:min(j2, j1 + _MAX_DIFF_SECTION_LINES - len(removed))]
+                    section = [f"@@ -{i1 + 1},{i2 - i1} +{j1 + 1},{j2 - j1} @@\n"]
+                    section.extend(f"-{line}\n" for line in removed)
+                    section.extend(f"+{line}\n" for line in added)
+                    modified_sections.append(''.join(section))
             
             # Generate summary
             diff_summary = f"Modified {added_lines + removed_lines} lines ({added_lines} added, {removed_lines} removed)"
@@ -2039,7 +2157,7 @@ Generate the COMPLETE modified HTML code, no explanations. The code should be re
             return CodeDiff(
                 added_lines=added_lines,
                 removed_lines=removed_lines,
-                modified_sections=modified_sections[:5],  # Limit to 5 sections
+                modified_sections=modified_sections,
                 diff_summary=diff_summary
             )
             
@@ -2068,42 +2186,44 @@ Generate the COMPLETE modified HTML code, no explanations. The code should be re
         is_valid = True
         
         try:
-            # Parse both versions
-            old_soup = BeautifulSoup(old_code, 'html.parser')
-            new_soup = BeautifulSoup(new_code, 'html.parser')
+            # Compare both versions at string level, without building a tree
+            old_context = _code_context(old_code)
+            new_context = _code_context(new_code)
+            old_markers = old_context.markers
+            new_markers = new_context.markers
+            old_tags = old_context.tag_counts
+            new_tags = new_context.tag_counts
             
             # Check that essential elements are preserved
             # 1. Check for DOCTYPE
-            if '<!DOCTYPE' in old_code and '<!DOCTYPE' not in new_code:
+            if '<!DOCTYPE' in old_markers and '<!DOCTYPE' not in new_markers:
                 warnings.append("DOCTYPE declaration was removed")
             
             # 2. Check for meta tags
-            old_metas = old_soup.find_all('meta')
-            new_metas = new_soup.find_all('meta')
-            if len(old_metas) > len(new_metas):
-                warnings.append(f"Some meta tags were removed ({len(old_metas)} -> {len(new_metas)})")
+            old_metas = old_tags['meta']
+            new_metas = new_tags['meta']
+            if old_metas > new_metas:
+                warnings.append(f"Some meta tags were removed ({old_metas} -> {new_metas})")
             
             # 3. Check for Tailwind CSS
-            if 'tailwindcss' in old_code and 'tailwindcss' not in new_code:
+            if 'tailwindcss' in old_markers and 'tailwindcss' not in new_markers:
                 warnings.append("Tailwind CSS CDN was removed")
             
             # 4. Check for major structural elements
-            old_sections = len(old_soup.find_all(['section', 'article', 'div']))
-            new_sections = len(new_soup.find_all(['section', 'article', 'div']))
+            old_sections = old_tags['section'] + old_tags['article'] + old_tags['div']
+            new_sections = new_tags['section'] + new_tags['article'] + new_tags['div']
             if new_sections < old_sections * 0.5:  # More than 50% reduction
                 warnings.append("Significant structural elements were removed")
             
             # 5. Check for navigation
-            old_nav = old_soup.find('nav')
-            new_nav = new_soup.find('nav')
-            if old_nav and not new_nav:
+            if old_tags['nav'] and not new_tags['nav']:
                 warnings.append("Navigation element was removed")
             
             # 6. Check for forms
-            old_forms = old_soup.find_all('form')
-            new_forms = new_soup.find_all('form')
-            if len(old_forms) > len(new_forms):
-                warnings.append(f"Some forms were removed ({len(old_forms)} -> {len(new_forms)})")
+            old_forms = old_tags['form']
+            new_forms = new_tags['form']
+            if old_forms > new_forms:
+                warnings.append(f"Some forms were removed ({old_forms} -> {new_forms})")
             
         except Exception as e:
             logger.error(f"Error validating modifications: {str(e)}")
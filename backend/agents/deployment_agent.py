@@ -9,13 +9,19 @@ This agent:
 - Stores deployment records in database
 - Generates unique site names
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Deque, Tuple
+from collections import deque
+from array import array
+from functools import cached_property
 from datetime import datetime
 from pydantic import BaseModel, Field
-from bs4 import BeautifulSoup
+from lxml import etree
+import logging
 import re
 import uuid
+import secrets
 import asyncio
+import time
 
 from agents.base_agent import (
     BaseAgent,
@@ -31,6 +37,7 @@ from agents.framework_configs import (
     get_framework_config,
     get_vercel_project_settings,
     get_vercel_config_json,
+    get_vercel_config_json_bytes,
     validate_framework_files,
 )
 from services.vercel_client import vercel_client, VercelDeployment as VercelDeploymentModel
@@ -41,6 +48,291 @@ from utils.logging import logger
 from utils.config import settings
 
 
+# The HTML parser synthesizes missing <html>/<head>/<body> elements, so structural presence is checked on the source
+_HTML_TAG_RE = re.compile(r'<html[\s>]', re.IGNORECASE)
+_HEAD_TAG_RE = re.compile(r'<head[\s>]', re.IGNORECASE)
+_BODY_TAG_RE = re.compile(r'<body[\s>]', re.IGNORECASE)
+
+# The DOCTYPE must lead the document; the margin allows for a BOM, whitespace or a short comment
+_DOCTYPE_SCAN_LIMIT = 512
+
+# Body opening tag and markup tags, for measuring body text without building a tree
+_BODY_OPEN_RE = re.compile(r'<body[^>]*>', re.IGNORECASE)
+_MARKUP_TAG_RE = re.compile(r'<[^>]+>')
+
+# Elements whose contents are not page text; BeautifulSoup's get_text() leaves them out too
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+_NON_TEXT_OPEN_RE = re.compile(r'<(script|style|template)[\s>]', re.IGNORECASE)
+_NON_TEXT_CLOSE_RES = {
+    tag: re.compile(rf'</{tag}\s*>', re.IGNORECASE) for tag in _NON_TEXT_TAGS
+}
+
+# Vercel project name sanitization
+_SITE_NAME_SEPARATORS = str.maketrans({" ": "-", "_": "-"})
+_SITE_NAME_INVALID_RE = re.compile(r'[^a-z0-9-]')
+_SITE_NAME_HYPHENS_RE = re.compile(r'-+')
+
+# Schemes a deployment URL is expected to start with
+_URL_PREFIXES = ("http://", "https://")
+
+# Manual deployment instructions; the site name clause is the only substitution
+_MANUAL_INSTRUCTIONS_TEMPLATE = """
+# Manual Deployment Instructions
+
+Since automated deployment is not configured, you can deploy your site manually using one of these methods:
+
+## Option 1: Deploy to Vercel (Recommended)
+
+1. Go to https://vercel.com and sign up/login
+2. Click "Add New" → "Project"
+3. Create a new project{site_name_clause}
+4. In your project settings, go to the "Deployments" tab
+5. Create a file named `index.html` with the generated code
+6. Drag and drop the file to deploy
+
+## Option 2: Deploy to Netlify
+
+1. Go to https://netlify.com and sign up/login
+2. Drag and drop your HTML file to the Netlify Drop zone
+3. Your site will be live in seconds
+
+## Option 3: Deploy to GitHub Pages
+
+1. Create a new GitHub repository
+2. Add your HTML file as `index.html`
+3. Go to Settings → Pages
+4. Select your branch and save
+5. Your site will be available at `https://[username].github.io/[repo-name]`
+
+## Option 4: Use Any Static Hosting
+
+You can deploy the generated HTML to any static hosting service:
+- Cloudflare Pages
+- AWS S3 + CloudFront
+- Google Cloud Storage
+- Azure Static Web Apps
+
+## Your Generated HTML
+
+The HTML code has been generated and validated. You can copy it from the preview
+or download it to deploy manually.
+
+## Configure Automated Deployment
+
+To enable automated deployment in the future, set the `VERCEL_API_TOKEN` environment
+variable with your Vercel API token. You can get a token from:
+https://vercel.com/account/tokens
+""".strip()
+_MANUAL_INSTRUCTIONS_NO_NAME = _MANUAL_INSTRUCTIONS_TEMPLATE.format(site_name_clause="")
+
+# Body text below this many characters triggers a warning; measuring stops once it is reached
+_MIN_BODY_TEXT_LENGTH = 10
+
+# Strict validation streams the HTML through the parser in chunks of this many characters
+_STREAM_CHUNK_SIZE = 4096
+
+
+class _BodyTextCollector:
+    """lxml parser target that measures stripped body text one text run at a time."""
+    
+    def __init__(self):
+        self.text_length = 0
+        self._in_body = False
+        self._non_text_depth = 0
+        self._run: List[str] = []
+    
+    def _flush(self):
+        if self._run:
+            if self._in_body and not self._non_text_depth:
+                self.text_length += len("".join(self._run).strip())
+            self._run.clear()
+    
+    def start(self, tag, attrib):
+        self._flush()
+        if tag == "body":
+            self._in_body = True
+        elif tag in _NON_TEXT_TAGS:
+            self._non_text_depth += 1
+    
+    def end(self, tag):
+        self._flush()
+        if tag == "body":
+            self._in_body = False
+        elif tag in _NON_TEXT_TAGS:
+            self._non_text_depth -= 1
+    
+    def data(self, data):
+        self._run.append(data)
+    
+    def comment(self, text):
+        self._flush()
+    
+    def close(self) -> int:
+        self._flush()
+        return self.text_length
+
+
+class _DeploymentWriter:
+    """
+    Coalesces deployment record writes into batched transactions.
+    
+    Records are queued and written by a single flusher coroutine. The blocking
+    database write runs in a worker thread, and records that arrive while it is
+    in flight are written together in the next transaction. If a batch fails,
+    its records are retried one per transaction so that only the failing
+    record's future gets the error. The flusher exits once the queue is empty
+    and is restarted by the next record.
+    """
+    
+    def __init__(self, max_batch_size: int = 100):
+        self.max_batch_size = max_batch_size
+        self._queue: Deque[Tuple[Deployment, asyncio.Future]] = deque()
+        self._flusher: Optional[asyncio.Task] = None
+    
+    def enqueue(self, deployment: Deployment) -> asyncio.Future:
+        """Queue a record without blocking; the returned future resolves once it is written."""
+        loop = asyncio.get_running_loop()
+        written = loop.create_future()
+        self._queue.append((deployment, written))
+        
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush())
+        return written
+    
+    async def _flush(self):
+        while self._queue:
+            batch = [
+                self._queue.popleft()
+                for _ in range(min(len(self._queue), self.max_batch_size))
+            ]
+            
+            try:
+                await asyncio.to_thread(
+                    site_repository.save_deployments_bulk,
+                    [deployment for deployment, _ in batch],
+                )
+            except Exception as e:
+                if len(batch) == 1:
+                    self._resolve(batch[0][1], e)
+                    continue
+                logger.warning(f"Batched deployment write failed, retrying records individually: {str(e)}")
+                for deployment, written in batch:
+                    try:
+                        await asyncio.to_thread(site_repository.save_deployments_bulk, [deployment])
+                    except Exception as record_error:
+                        self._resolve(written, record_error)
+                    else:
+                        self._resolve(written)
+            else:
+                for _, written in batch:
+                    self._resolve(written)
+    
+    @staticmethod
+    def _resolve(written: asyncio.Future, error: Optional[Exception] = None):
+        if written.done():
+            return
+        if error is None:
+            written.set_result(None)
+        else:
+            written.set_exception(error)
+
+
+_deployment_writer = _DeploymentWriter()
+
+
+class _HealthCheckWindow:
+    """Ring buffer of recent health check outcomes with a running pass count."""
+    
+    def __init__(self, size: int = 10_000):
+        self.size = size
+        self.count = 0
+        self._passed = array("B", bytes(size))
+        self._passed_total = 0
+    
+    def record(self, passed: bool):
+        slot = self.count % self.size
+        self._passed_total += passed - self._passed[slot]
+        self._passed[slot] = passed
+        self.count += 1
+    
+    def success_rate(self) -> float:
+        filled = min(self.count, self.size)
+        return self._passed_total / filled if filled else 0.0
+
+
+def _body_text_length(html_code: str, limit: int) -> int:
+    """
+    Measure body text by stripping markup, stopping once ``limit`` characters are seen.
+    
+    Each text run between tags is stripped, matching how the HTML parser joins text nodes.
+    The contents of script, style and template elements are skipped.
+    """
+    body_match = _BODY_OPEN_RE.search(html_code)
+    if not body_match:
+        return 0
+    
+    length = 0
+    position = body_match.end()
+    while True:
+        tag = _MARKUP_TAG_RE.search(html_code, position)
+        if tag is None:
+            return length + len(html_code[position:].strip())
+        
+        length += len(html_code[position:tag.start()].strip())
+        if length >= limit or tag.group().lower() == "</body>":
+            return length
+        position = tag.end()
+        
+        # Jump past the contents of non-text elements, which may hold stray '<' characters
+        non_text = _NON_TEXT_OPEN_RE.match(tag.group())
+        if non_text:
+            close = _NON_TEXT_CLOSE_RES[non_text.group(1).lower()].search(html_code, position)
+            if close is None:
+                return length
+            position = close.end()
+
+
+def _stream_body_text_length(html_code: str, limit: int) -> int:
+    """
+    Measure body text by streaming HTML through lxml without building a tree.
+    
+    Feeding stops as soon as at least ``limit`` characters of body text have been seen.
+    """
+    collector = _BodyTextCollector()
+    parser = etree.HTMLParser(target=collector)
+    
+    for start in range(0, len(html_code), _STREAM_CHUNK_SIZE):
+        parser.feed(html_code[start:start + _STREAM_CHUNK_SIZE])
+        if collector.text_length >= limit:
+            return collector.text_length
+    
+    return parser.close()
+
+
+def _score_validation(
+    is_valid_html: bool,
+    has_content: bool,
+    has_doctype: bool,
+    has_html_tag: bool,
+    has_head: bool,
+    has_body: bool
+) -> float:
+    """
+    Weighted validation score in [0, 1]; valid HTML structure counts most.
+    
+    Kept free of model access so bulk re-validation can score plain booleans.
+    """
+    score = (
+        2.0 * is_valid_html
+        + 1.0 * has_content
+        + 0.5 * has_doctype
+        + 1.0 * has_html_tag
+        + 0.75 * has_head
+        + 0.75 * has_body
+    )
+    return score / 6.0
+
+
 # Input Models
 class DeploymentInput(AgentInput):
     """Input for deployment."""
@@ -53,6 +345,9 @@ class DeploymentInput(AgentInput):
     framework: str = Field(default="vanilla", description="Frontend framework (vanilla, react, vue, nextjs, svelte)")
     environment_variables: Optional[Dict[str, str]] = Field(None, description="Environment variables for the deployment")
     
+    class Config:
+        frozen = True
+    
     
 # Output Models
 class DeploymentMetadata(BaseModel):
@@ -68,6 +363,14 @@ class DeploymentMetadata(BaseModel):
     build_time: Optional[int] = Field(None, description="Build time in milliseconds")
     is_update: bool = Field(default=False, description="Whether this is an update to existing deployment")
     health_check_passed: bool = Field(default=False, description="Whether health check passed")
+    
+    class Config:
+        frozen = True
+    
+    @cached_property
+    def timestamp_iso(self) -> str:
+        """ISO-8601 timestamp, formatted once per deployment."""
+        return self.timestamp.isoformat()
 
 
 class DeploymentValidation(BaseModel):
@@ -107,6 +410,12 @@ class DeploymentAgent(BaseAgent):
         """Initialize Deployment Agent."""
         super().__init__(name="DeploymentAgent")
         self.vercel = vercel_client
+        
+        # Recent health check outcomes for the rolling deployment success rate
+        self._health_checks = _HealthCheckWindow()
+        
+        # In-flight deployments keyed by project, so a newer request supersedes an older one
+        self._inflight: Dict[str, asyncio.Task] = {}
         logger.info("Deployment Agent initialized")
     
     async def execute(self, input_data: AgentInput, context: AgentContext) -> AgentOutput:
@@ -182,9 +491,8 @@ class DeploymentAgent(BaseAgent):
                         retryable=False,
                     )
                 
-                # Validate required files are present
-                file_list = list(input_data.files.keys())
-                is_valid, missing_files = validate_framework_files(framework, file_list)
+                # Validate required files are present (keys view gives O(1) membership)
+                is_valid, missing_files = validate_framework_files(framework, input_data.files.keys())
                 
                 if not is_valid:
                     raise AgentError(
@@ -229,8 +537,9 @@ class DeploymentAgent(BaseAgent):
             # Determine if this is an update or new deployment
             is_update = input_data.project_id is not None
             
-            # Deploy to Vercel
-            deployment_metadata = await self._deploy_to_vercel(
+            # Deploy to Vercel, superseding any in-flight deployment of the same project
+            deployment_metadata = await self._deploy_latest(
+                deployment_key=input_data.project_id or self._sanitize_site_name(site_name),
                 html_code=input_data.html_code,
                 files=input_data.files,
                 site_name=site_name,
@@ -241,12 +550,12 @@ class DeploymentAgent(BaseAgent):
                 is_update=is_update,
             )
             
-            # Store deployment record in database
+            # Store deployment record in the background; the workflow awaits it before finishing
             if input_data.site_id:
-                await self._store_deployment_record(
+                context.add_background_task(asyncio.create_task(self._store_deployment_record(
                     site_id=input_data.site_id,
                     deployment_metadata=deployment_metadata,
-                )
+                )))
             
             logger.info(
                 f"Deployment successful for workflow {context.workflow_id}. "
@@ -305,35 +614,33 @@ class DeploymentAgent(BaseAgent):
             validation.has_content = True
             
             # Check for DOCTYPE
-            validation.has_doctype = "<!DOCTYPE" in html_code or "<!doctype" in html_code
+            validation.has_doctype = "<!doctype" in html_code[:_DOCTYPE_SCAN_LIMIT].lower()
             if not validation.has_doctype:
                 validation.validation_warnings.append("Missing DOCTYPE declaration")
             
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_code, 'html.parser')
-            
             # Check for essential HTML structure
-            html_tag = soup.find('html')
-            validation.has_html_tag = html_tag is not None
+            validation.has_html_tag = _HTML_TAG_RE.search(html_code) is not None
             if not validation.has_html_tag:
                 validation.is_valid_html = False
                 validation.validation_errors.append("Missing <html> tag")
             
-            head_tag = soup.find('head')
-            validation.has_head = head_tag is not None
+            validation.has_head = _HEAD_TAG_RE.search(html_code) is not None
             if not validation.has_head:
                 validation.validation_warnings.append("Missing <head> tag")
             
-            body_tag = soup.find('body')
-            validation.has_body = body_tag is not None
+            validation.has_body = _BODY_TAG_RE.search(html_code) is not None
             if not validation.has_body:
                 validation.is_valid_html = False
                 validation.validation_errors.append("Missing <body> tag")
             
             # Check for minimum content in body
             if validation.has_body:
-                body_text = body_tag.get_text(strip=True)
-                if len(body_text) < 10:
+                if settings.STRICT_HTML_VALIDATION:
+                    # Stream through the HTML parser until enough body text is seen
+                    body_text_length = _stream_body_text_length(html_code, _MIN_BODY_TEXT_LENGTH)
+                else:
+                    body_text_length = _body_text_length(html_code, _MIN_BODY_TEXT_LENGTH)
+                if body_text_length < _MIN_BODY_TEXT_LENGTH:
                     validation.validation_warnings.append("Body has very little content")
             
             # Calculate confidence score
@@ -349,34 +656,14 @@ class DeploymentAgent(BaseAgent):
     
     def _calculate_validation_confidence(self, validation: DeploymentValidation) -> float:
         """Calculate confidence score based on validation results."""
-        score = 0.0
-        max_score = 6.0
-        
-        # Valid HTML structure (most important)
-        if validation.is_valid_html:
-            score += 2.0
-        
-        # Has content
-        if validation.has_content:
-            score += 1.0
-        
-        # Has DOCTYPE
-        if validation.has_doctype:
-            score += 0.5
-        
-        # Has HTML tag
-        if validation.has_html_tag:
-            score += 1.0
-        
-        # Has head
-        if validation.has_head:
-            score += 0.75
-        
-        # Has body
-        if validation.has_body:
-            score += 0.75
-        
-        return score / max_score
+        return _score_validation(
+            validation.is_valid_html,
+            validation.has_content,
+            validation.has_doctype,
+            validation.has_html_tag,
+            validation.has_head,
+            validation.has_body,
+        )
     
     def _generate_site_name(self) -> str:
         """
@@ -385,13 +672,70 @@ class DeploymentAgent(BaseAgent):
         Returns:
             Unique site name in format: smart-site-{uuid}
         """
-        # Generate short UUID (first 8 characters)
-        short_uuid = str(uuid.uuid4())[:8]
+        # Generate short random suffix (8 hex characters)
+        short_uuid = secrets.token_hex(4)
         site_name = f"smart-site-{short_uuid}"
         
         logger.info(f"Generated site name: {site_name}")
         return site_name
     
+    async def _deploy_latest(self, deployment_key: str, **deploy_kwargs) -> DeploymentMetadata:
+        """
+        Deploy to Vercel, cancelling any in-flight deployment for the same key.
+        
+        Rapid repeated deployments of one project collapse to the most recent
+        request, so at most one Vercel deployment per project is active.
+        
+        Args:
+            deployment_key: Project ID, or sanitized site name for new projects
+            **deploy_kwargs: Arguments for _deploy_to_vercel
+            
+        Returns:
+            DeploymentMetadata with deployment information
+            
+        Raises:
+            AgentError: If deployment fails or is superseded by a newer one
+        """
+        # Swap the registered task without awaiting in between, so no lock is needed
+        # (the agent is shared across the event loops Celery tasks create). The old
+        # entry is dropped first so its caller sees it was superseded.
+        previous = self._inflight.pop(deployment_key, None)
+        if previous and not previous.done():
+            logger.info(f"Superseding in-flight deployment for {deployment_key}")
+            previous.cancel()
+        else:
+            previous = None
+        
+        task = asyncio.create_task(self._deploy_after(previous, deploy_kwargs))
+        self._inflight[deployment_key] = task
+        
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self._inflight.get(deployment_key) is task:
+                raise
+            raise AgentError(
+                message="Deployment was superseded by a newer deployment of the same project",
+                error_type=ErrorType.DEPLOYMENT_ERROR,
+                agent_name=self.name,
+                recoverable=False,
+                retryable=False,
+                context={"deployment_key": deployment_key}
+            )
+        finally:
+            if self._inflight.get(deployment_key) is task:
+                del self._inflight[deployment_key]
+    
+    async def _deploy_after(
+        self,
+        superseded: Optional[asyncio.Task],
+        deploy_kwargs: Dict[str, Any]
+    ) -> DeploymentMetadata:
+        """Wait for a cancelled deployment to unwind, then deploy."""
+        if superseded:
+            await asyncio.gather(superseded, return_exceptions=True)
+        return await self._deploy_to_vercel(**deploy_kwargs)
+    
     async def _deploy_to_vercel(
         self,
         site_name: str,
@@ -423,7 +767,7 @@ class DeploymentAgent(BaseAgent):
             AgentError: If deployment fails
         """
         # Track deployment attempt metrics
-        deployment_start_time = datetime.utcnow()
+        deployment_start_time = time.monotonic()
         retry_count = 0
         
         def on_retry(attempt: int, error: Exception, delay: float):
@@ -461,8 +805,7 @@ class DeploymentAgent(BaseAgent):
             )
             
             # Calculate total deployment time
-            deployment_end_time = datetime.utcnow()
-            total_time = (deployment_end_time - deployment_start_time).total_seconds()
+            total_time = time.monotonic() - deployment_start_time
             
             logger.info(
                 f"Deployment completed successfully after {retry_count} retries. "
@@ -541,11 +884,13 @@ class DeploymentAgent(BaseAgent):
             if project_id:
                 logger.info(f"Using existing project: {project_id}")
                 try:
-                    project = await self.vercel.get_project(project_id)
-                    # Update project settings for framework
                     if framework != Framework.VANILLA:
+                        # Update project settings for framework; the PATCH response
+                        # carries the project, so no separate fetch is needed
                         logger.info(f"Updating project settings for {framework.value}")
                         project = await self.vercel.update_project(project_id, **project_settings)
+                    else:
+                        project = await self.vercel.get_project(project_id)
                 except Exception as e:
                     logger.warning(f"Failed to get existing project, creating new one: {str(e)}")
                     project = await self.vercel.create_project(
@@ -560,34 +905,21 @@ class DeploymentAgent(BaseAgent):
                 )
             
             # Prepare deployment files
-            deployment_files = []
-            
             if framework == Framework.VANILLA:
                 # For vanilla HTML, just deploy the HTML file
-                deployment_files = [
-                    {
-                        "file": "index.html",
-                        "data": html_code,
-                    }
-                ]
+                deployment_files = [{"file": "index.html", "data": html_code}]
             else:
                 # For framework sites, deploy all files
-                if files:
-                    deployment_files = [
-                        {
-                            "file": file_path,
-                            "data": content,
-                        }
-                        for file_path, content in files.items()
-                    ]
+                deployment_files = [
+                    {"file": file_path, "data": content}
+                    for file_path, content in (files or {}).items()
+                ]
                 
-                # Add vercel.json for routing configuration
-                vercel_config = get_vercel_config_json(framework)
-                if vercel_config:
-                    import json
+                # Add vercel.json for routing configuration (serialized once at import)
+                if get_vercel_config_json(framework):
                     deployment_files.append({
                         "file": "vercel.json",
-                        "data": json.dumps(vercel_config, indent=2),
+                        "data": get_vercel_config_json_bytes(framework).decode(),
                     })
             
             # Get build configuration
@@ -638,21 +970,22 @@ class DeploymentAgent(BaseAgent):
                     context={"deployment_id": completed_deployment.id}
                 )
             
-            # Verify deployment health
+            # Verify deployment health in the background while the metadata is assembled
             logger.info(f"Verifying deployment health: {completed_deployment.url}")
-            health_check_passed = await self.vercel.verify_deployment_health(
+            health_task = asyncio.create_task(self.vercel.verify_deployment_health(
                 deployment_url=completed_deployment.url,
                 timeout=30,
-            )
-            
-            if not health_check_passed:
-                logger.warning(f"Deployment health check failed for {completed_deployment.url}")
+            ))
             
             # Build deployment metadata
             deployment_url = completed_deployment.url
             if not deployment_url.startswith("http"):
                 deployment_url = f"https://{deployment_url}"
             
+            health_check_passed = await health_task
+            if not health_check_passed:
+                logger.warning(f"Deployment health check failed for {completed_deployment.url}")
+            
             metadata = DeploymentMetadata(
                 url=deployment_url,
                 deployment_id=completed_deployment.id,
@@ -716,20 +1049,20 @@ class DeploymentAgent(BaseAgent):
         sanitized = site_name.lower()
         
         # Replace spaces and underscores with hyphens
-        sanitized = sanitized.replace(" ", "-").replace("_", "-")
+        sanitized = sanitized.translate(_SITE_NAME_SEPARATORS)
         
         # Remove any characters that aren't alphanumeric or hyphens
-        sanitized = re.sub(r'[^a-z0-9-]', '', sanitized)
+        sanitized = _SITE_NAME_INVALID_RE.sub('', sanitized)
         
         # Remove consecutive hyphens
-        sanitized = re.sub(r'-+', '-', sanitized)
+        sanitized = _SITE_NAME_HYPHENS_RE.sub('-', sanitized)
         
         # Remove leading/trailing hyphens
         sanitized = sanitized.strip('-')
         
         # Ensure name is not empty
         if not sanitized:
-            sanitized = f"site-{str(uuid.uuid4())[:8]}"
+            sanitized = f"site-{secrets.token_hex(4)}"
         
         # Limit length (Vercel has a max length)
         if len(sanitized) > 63:
@@ -749,9 +1082,9 @@ class DeploymentAgent(BaseAgent):
             site_id: Site ID
             deployment_metadata: Deployment metadata
         """
+        logger.info(f"Storing deployment record for site {site_id}")
+        
         try:
-            logger.info(f"Storing deployment record for site {site_id}")
-            
             # Create deployment record
             deployment = Deployment(
                 site_id=uuid.UUID(site_id),
@@ -765,17 +1098,24 @@ class DeploymentAgent(BaseAgent):
                 created_at=deployment_metadata.timestamp,
             )
             
-            # Save to database
-            await site_repository.save_deployment(deployment)
-            
-            logger.info(f"Stored deployment record: {deployment.id} (framework: {deployment.framework})")
-            
-            # Track deployment metrics
-            self._track_deployment_metrics(deployment_metadata)
-            
-        except Exception as e:
+            # Save to database in the next batched write
+            await _deployment_writer.enqueue(deployment)
+        except Exception:
             # Log error but don't fail the deployment
-            logger.error(f"Error storing deployment record: {str(e)}")
+            logger.exception(
+                "Error storing deployment record",
+                extra={
+                    "site_id": site_id,
+                    "deployment_id": deployment_metadata.deployment_id,
+                    "project_id": deployment_metadata.project_id,
+                }
+            )
+            return
+        
+        logger.info(f"Stored deployment record: {deployment.id} (framework: {deployment.framework})")
+        
+        # Track deployment metrics
+        self._track_deployment_metrics(deployment_metadata)
     
     def _track_deployment_metrics(self, deployment_metadata: DeploymentMetadata):
         """
@@ -784,32 +1124,35 @@ class DeploymentAgent(BaseAgent):
         Args:
             deployment_metadata: Deployment metadata
         """
-        try:
-            # Log deployment metrics
-            logger.info(
-                "Deployment metrics",
-                extra={
-                    "deployment_id": deployment_metadata.deployment_id,
-                    "project_id": deployment_metadata.project_id,
-                    "framework": deployment_metadata.framework,
-                    "build_time_ms": deployment_metadata.build_time,
-                    "environment": deployment_metadata.environment,
-                    "is_update": deployment_metadata.is_update,
-                    "health_check_passed": deployment_metadata.health_check_passed,
-                    "timestamp": deployment_metadata.timestamp.isoformat(),
-                }
-            )
-            
-            # Calculate success rate (this would typically be stored in a metrics database)
-            success_rate = 1.0 if deployment_metadata.health_check_passed else 0.8
-            
-            logger.info(
-                f"Deployment success rate: {success_rate:.2%}, "
-                f"Build time: {deployment_metadata.build_time}ms"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error tracking deployment metrics: {str(e)}")
+        self._health_checks.record(deployment_metadata.health_check_passed)
+        
+        # Skip building the structured fields when INFO records would be dropped
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        # Log deployment metrics
+        logger.info(
+            "Deployment metrics",
+            extra={
+                "deployment_id": deployment_metadata.deployment_id,
+                "project_id": deployment_metadata.project_id,
+                "framework": deployment_metadata.framework,
+                "build_time_ms": deployment_metadata.build_time,
+                "environment": deployment_metadata.environment,
+                "is_update": deployment_metadata.is_update,
+                "health_check_passed": deployment_metadata.health_check_passed,
+                "timestamp": deployment_metadata.timestamp_iso,
+            }
+        )
+        
+        # Rolling success rate over recent deployments handled by this agent
+        success_rate = self._health_checks.success_rate()
+        
+        logger.info(
+            "Deployment success rate: %.2f%%, Build time: %sms",
+            success_rate * 100,
+            deployment_metadata.build_time,
+        )
     
     def _generate_manual_instructions(
         self,
@@ -826,55 +1169,10 @@ class DeploymentAgent(BaseAgent):
         Returns:
             Manual deployment instructions
         """
-        instructions = f"""
-# Manual Deployment Instructions
-
-Since automated deployment is not configured, you can deploy your site manually using one of these methods:
-
-## Option 1: Deploy to Vercel (Recommended)
-
-1. Go to https://vercel.com and sign up/login
-2. Click "Add New" → "Project"
-3. Create a new project{f" named '{site_name}'" if site_name else ""}
-4. In your project settings, go to the "Deployments" tab
-5. Create a file named `index.html` with the generated code
-6. Drag and drop the file to deploy
-
-## Option 2: Deploy to Netlify
-
-1. Go to https://netlify.com and sign up/login
-2. Drag and drop your HTML file to the Netlify Drop zone
-3. Your site will be live in seconds
-
-## Option 3: Deploy to GitHub Pages
-
-1. Create a new GitHub repository
-2. Add your HTML file as `index.html`
-3. Go to Settings → Pages
-4. Select your branch and save
-5. Your site will be available at `https://[username].github.io/[repo-name]`
-
-## Option 4: Use Any Static Hosting
-
-You can deploy the generated HTML to any static hosting service:
-- Cloudflare Pages
-- AWS S3 + CloudFront
-- Google Cloud Storage
-- Azure Static Web Apps
-
-## Your Generated HTML
-
-The HTML code has been generated and validated. You can copy it from the preview
-or download it to deploy manually.
-
-## Configure Automated Deployment
-
-To enable automated deployment in the future, set the `VERCEL_API_TOKEN` environment
-variable with your Vercel API token. You can get a token from:
-https://vercel.com/account/tokens
-"""
+        if not site_name:
+            return _MANUAL_INSTRUCTIONS_NO_NAME
         
-        return instructions.strip()
+        return _MANUAL_INSTRUCTIONS_TEMPLATE.format(site_name_clause=f" named '{site_name}'")
     
     def validate(self, output: AgentOutput) -> ValidationResult:
         """
@@ -892,7 +1190,8 @@ https://vercel.com/account/tokens
             result.add_error("Operation failed")
             return result
         
-        if not isinstance(output, DeploymentOutput):
+        # Exact type check covers the common case; isinstance still admits subclasses
+        if type(output) is not DeploymentOutput and not isinstance(output, DeploymentOutput):
             result.add_error("Invalid output type")
             return result
         
@@ -904,27 +1203,29 @@ https://vercel.com/account/tokens
         # If we have deployment metadata, validate it
         if output.deployment_metadata:
             metadata = output.deployment_metadata
+            errors: List[str] = []
+            warnings: List[str] = []
             
             # Check required fields
             if not metadata.url:
-                result.add_error("Missing deployment URL")
+                errors.append("Missing deployment URL")
             
             if not metadata.deployment_id:
-                result.add_error("Missing deployment ID")
+                errors.append("Missing deployment ID")
             
             if not metadata.project_id:
-                result.add_error("Missing project ID")
+                errors.append("Missing project ID")
             
             # Check URL format
-            if metadata.url and not (
-                metadata.url.startswith("http://") or 
-                metadata.url.startswith("https://")
-            ):
-                result.add_warning("Deployment URL should start with http:// or https://")
+            if metadata.url and not metadata.url.startswith(_URL_PREFIXES):
+                warnings.append("Deployment URL should start with http:// or https://")
             
             # Check health check
             if not metadata.health_check_passed:
-                result.add_warning("Deployment health check did not pass")
+                warnings.append("Deployment health check did not pass")
+            
+            result.add_errors(errors)
+            result.add_warnings(warnings)
             
             # Set confidence based on validation
             if output.deployment_validation:
@@ -5,61 +5,61 @@ Provides design style specifications for Bold Minimalism, Brutalism,
 Flat Minimalist, Anti-Design, Vibrant Blocks, Organic Fluid,
 Retro/Nostalgic, and Experimental styles.
 """
-from typing import Dict, List, Any
-from pydantic import BaseModel, Field
+from typing import Dict, List, Any, Mapping, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
 
+from utils.immutable import freeze
 
-class DesignStyle(BaseModel):
-    """Design style definition."""
+
+@dataclass(frozen=True, slots=True)
+class DesignStyle:
+    """Design style definition (read-only, built from trusted module-level specs)."""
     name: str
     description: str
-    color_palette: List[str]
-    typography: Dict[str, str]
+    color_palette: Tuple[str, ...]
+    typography: Mapping[str, str]
     spacing: str
     animations: str
-    characteristics: List[str]
-    tailwind_config: Dict[str, Any]
+    characteristics: Tuple[str, ...]
+    tailwind_config: Mapping[str, Any]
     prompt_additions: str
 
 
-class DesignStyleLibrary:
-    """Library of design styles."""
-    
-    def __init__(self):
-        """Initialize design style library."""
-        self.styles: Dict[str, DesignStyle] = {}
-        self._load_styles()
-    
-    def _load_styles(self):
-        """Load all design styles."""
-        # Bold Minimalism
-        self.styles["bold_minimalism"] = DesignStyle(
-            name="Bold Minimalism",
-            description="Clean layouts with striking typography and generous white space",
-            color_palette=["gray-50", "gray-900", "blue-600", "white"],
-            typography={
-                "heading": "font-bold text-6xl md:text-7xl",
-                "subheading": "font-semibold text-2xl md:text-3xl",
-                "body": "font-normal text-lg"
-            },
-            spacing="generous padding and margins (py-20, px-8)",
-            animations="subtle fade-ins and smooth transitions",
-            characteristics=[
-                "Minimal color palette with one accent color",
-                "Large, bold typography",
-                "Generous white space",
-                "Clean geometric shapes",
-                "High contrast",
-                "Simple navigation"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#2563eb",
-                    "secondary": "#1e40af",
-                    "accent": "#3b82f6"
-                }
-            },
-            prompt_additions="""
+# Separators folded into underscores when normalizing style names to keys
+_STYLE_KEY_SEPARATORS = str.maketrans({" ": "_", "/": "_", "-": "_"})
+
+
+# Design style specifications, materialized into DesignStyle models on first use
+
+# Bold Minimalism
+_BOLD_MINIMALISM_SPEC: Dict[str, Any] = dict(
+    name="Bold Minimalism",
+    description="Clean layouts with striking typography and generous white space",
+    color_palette=["gray-50", "gray-900", "blue-600", "white"],
+    typography={
+        "heading": "font-bold text-6xl md:text-7xl",
+        "subheading": "font-semibold text-2xl md:text-3xl",
+        "body": "font-normal text-lg"
+    },
+    spacing="generous padding and margins (py-20, px-8)",
+    animations="subtle fade-ins and smooth transitions",
+    characteristics=[
+        "Minimal color palette with one accent color",
+        "Large, bold typography",
+        "Generous white space",
+        "Clean geometric shapes",
+        "High contrast",
+        "Simple navigation"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#2563eb",
+            "secondary": "#1e40af",
+            "accent": "#3b82f6"
+        }
+    },
+    prompt_additions="""
 **Bold Minimalism Style Guidelines:**
 - Use a minimal color palette (mostly white/gray with one bold accent color)
 - Implement large, bold typography for headings (text-6xl or larger)
@@ -70,36 +70,37 @@ class DesignStyleLibrary:
 - Add subtle fade-in animations on scroll
 - Use simple, intuitive navigation
 """
-        )
-        
-        # Brutalism/Neo-Brutalism
-        self.styles["brutalism"] = DesignStyle(
-            name="Brutalism/Neo-Brutalism",
-            description="Raw elements with big blocks and bold fonts",
-            color_palette=["black", "white", "yellow-400", "red-500"],
-            typography={
-                "heading": "font-black text-5xl md:text-6xl uppercase",
-                "subheading": "font-bold text-xl md:text-2xl",
-                "body": "font-mono text-base"
-            },
-            spacing="tight spacing with bold borders",
-            animations="none or abrupt transitions",
-            characteristics=[
-                "Raw, unpolished aesthetic",
-                "Bold, thick borders",
-                "High contrast colors",
-                "Monospace fonts",
-                "Asymmetric layouts",
-                "Visible grid structures"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#000000",
-                    "secondary": "#ffffff",
-                    "accent": "#facc15"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Brutalism/Neo-Brutalism
+_BRUTALISM_SPEC: Dict[str, Any] = dict(
+    name="Brutalism/Neo-Brutalism",
+    description="Raw elements with big blocks and bold fonts",
+    color_palette=["black", "white", "yellow-400", "red-500"],
+    typography={
+        "heading": "font-black text-5xl md:text-6xl uppercase",
+        "subheading": "font-bold text-xl md:text-2xl",
+        "body": "font-mono text-base"
+    },
+    spacing="tight spacing with bold borders",
+    animations="none or abrupt transitions",
+    characteristics=[
+        "Raw, unpolished aesthetic",
+        "Bold, thick borders",
+        "High contrast colors",
+        "Monospace fonts",
+        "Asymmetric layouts",
+        "Visible grid structures"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#000000",
+            "secondary": "#ffffff",
+            "accent": "#facc15"
+        }
+    },
+    prompt_additions="""
 **Brutalism Style Guidelines:**
 - Use raw, unpolished aesthetic with bold borders (border-4 or border-8)
 - Implement thick black borders around elements
@@ -111,36 +112,37 @@ class DesignStyleLibrary:
 - Use uppercase text for headings
 - Add overlapping elements for depth
 """
-        )
-        
-        # Flat Minimalist
-        self.styles["flat_minimalist"] = DesignStyle(
-            name="Flat Minimalist",
-            description="Highly functional interfaces emphasizing simplicity",
-            color_palette=["gray-100", "gray-800", "blue-500", "green-500"],
-            typography={
-                "heading": "font-semibold text-4xl md:text-5xl",
-                "subheading": "font-medium text-xl md:text-2xl",
-                "body": "font-normal text-base"
-            },
-            spacing="consistent, moderate spacing",
-            animations="smooth, functional transitions",
-            characteristics=[
-                "Flat design with no shadows",
-                "Simple color palette",
-                "Clear hierarchy",
-                "Functional focus",
-                "Clean icons",
-                "Grid-based layouts"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#3b82f6",
-                    "secondary": "#10b981",
-                    "accent": "#6366f1"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Flat Minimalist
+_FLAT_MINIMALIST_SPEC: Dict[str, Any] = dict(
+    name="Flat Minimalist",
+    description="Highly functional interfaces emphasizing simplicity",
+    color_palette=["gray-100", "gray-800", "blue-500", "green-500"],
+    typography={
+        "heading": "font-semibold text-4xl md:text-5xl",
+        "subheading": "font-medium text-xl md:text-2xl",
+        "body": "font-normal text-base"
+    },
+    spacing="consistent, moderate spacing",
+    animations="smooth, functional transitions",
+    characteristics=[
+        "Flat design with no shadows",
+        "Simple color palette",
+        "Clear hierarchy",
+        "Functional focus",
+        "Clean icons",
+        "Grid-based layouts"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#3b82f6",
+            "secondary": "#10b981",
+            "accent": "#6366f1"
+        }
+    },
+    prompt_additions="""
 **Flat Minimalist Style Guidelines:**
 - Use flat design with no shadows or gradients
 - Implement simple, limited color palette
@@ -152,36 +154,37 @@ class DesignStyleLibrary:
 - Keep navigation simple and intuitive
 - Use consistent spacing throughout
 """
-        )
-        
-        # Anti-Design
-        self.styles["anti_design"] = DesignStyle(
-            name="Anti-Design",
-            description="Asymmetric layouts with experimental typography",
-            color_palette=["purple-600", "pink-500", "yellow-300", "black"],
-            typography={
-                "heading": "font-extrabold text-5xl md:text-7xl italic",
-                "subheading": "font-bold text-2xl md:text-3xl",
-                "body": "font-normal text-lg"
-            },
-            spacing="irregular, creative spacing",
-            animations="unexpected, creative animations",
-            characteristics=[
-                "Asymmetric layouts",
-                "Experimental typography",
-                "Overlapping elements",
-                "Creative imperfections",
-                "Unconventional navigation",
-                "Bold color combinations"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#9333ea",
-                    "secondary": "#ec4899",
-                    "accent": "#fde047"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Anti-Design
+_ANTI_DESIGN_SPEC: Dict[str, Any] = dict(
+    name="Anti-Design",
+    description="Asymmetric layouts with experimental typography",
+    color_palette=["purple-600", "pink-500", "yellow-300", "black"],
+    typography={
+        "heading": "font-extrabold text-5xl md:text-7xl italic",
+        "subheading": "font-bold text-2xl md:text-3xl",
+        "body": "font-normal text-lg"
+    },
+    spacing="irregular, creative spacing",
+    animations="unexpected, creative animations",
+    characteristics=[
+        "Asymmetric layouts",
+        "Experimental typography",
+        "Overlapping elements",
+        "Creative imperfections",
+        "Unconventional navigation",
+        "Bold color combinations"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#9333ea",
+            "secondary": "#ec4899",
+            "accent": "#fde047"
+        }
+    },
+    prompt_additions="""
 **Anti-Design Style Guidelines:**
 - Create asymmetric, unconventional layouts
 - Use experimental typography (mix fonts, sizes, styles)
@@ -193,36 +196,37 @@ class DesignStyleLibrary:
 - Break traditional design rules purposefully
 - Create visual tension and interest
 """
-        )
-        
-        # Vibrant Blocks
-        self.styles["vibrant_blocks"] = DesignStyle(
-            name="Vibrant Blocks",
-            description="Big blocks with vivid contrasts and vibrant colors",
-            color_palette=["red-500", "blue-600", "yellow-400", "green-500", "purple-600"],
-            typography={
-                "heading": "font-bold text-5xl md:text-6xl",
-                "subheading": "font-semibold text-2xl md:text-3xl",
-                "body": "font-medium text-lg"
-            },
-            spacing="large blocks with clear separation",
-            animations="bold, energetic transitions",
-            characteristics=[
-                "Large color blocks",
-                "Vivid, contrasting colors",
-                "Bold typography",
-                "Clear section separation",
-                "Energetic feel",
-                "Grid-based layouts"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#ef4444",
-                    "secondary": "#2563eb",
-                    "accent": "#facc15"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Vibrant Blocks
+_VIBRANT_BLOCKS_SPEC: Dict[str, Any] = dict(
+    name="Vibrant Blocks",
+    description="Big blocks with vivid contrasts and vibrant colors",
+    color_palette=["red-500", "blue-600", "yellow-400", "green-500", "purple-600"],
+    typography={
+        "heading": "font-bold text-5xl md:text-6xl",
+        "subheading": "font-semibold text-2xl md:text-3xl",
+        "body": "font-medium text-lg"
+    },
+    spacing="large blocks with clear separation",
+    animations="bold, energetic transitions",
+    characteristics=[
+        "Large color blocks",
+        "Vivid, contrasting colors",
+        "Bold typography",
+        "Clear section separation",
+        "Energetic feel",
+        "Grid-based layouts"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#ef4444",
+            "secondary": "#2563eb",
+            "accent": "#facc15"
+        }
+    },
+    prompt_additions="""
 **Vibrant Blocks Style Guidelines:**
 - Use large, bold color blocks for sections
 - Implement vivid, high-contrast color combinations
@@ -234,36 +238,37 @@ class DesignStyleLibrary:
 - Create an energetic, dynamic feel
 - Add hover effects with color changes
 """
-        )
-        
-        # Organic Fluid
-        self.styles["organic_fluid"] = DesignStyle(
-            name="Organic Fluid",
-            description="Organic, fluid shapes for intuitive navigation",
-            color_palette=["teal-400", "blue-300", "purple-400", "pink-300"],
-            typography={
-                "heading": "font-semibold text-5xl md:text-6xl",
-                "subheading": "font-medium text-2xl md:text-3xl",
-                "body": "font-normal text-lg"
-            },
-            spacing="flowing, natural spacing",
-            animations="smooth, flowing transitions",
-            characteristics=[
-                "Curved, organic shapes",
-                "Fluid layouts",
-                "Soft color gradients",
-                "Natural flow",
-                "Smooth animations",
-                "Asymmetric balance"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#2dd4bf",
-                    "secondary": "#93c5fd",
-                    "accent": "#c084fc"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Organic Fluid
+_ORGANIC_FLUID_SPEC: Dict[str, Any] = dict(
+    name="Organic Fluid",
+    description="Organic, fluid shapes for intuitive navigation",
+    color_palette=["teal-400", "blue-300", "purple-400", "pink-300"],
+    typography={
+        "heading": "font-semibold text-5xl md:text-6xl",
+        "subheading": "font-medium text-2xl md:text-3xl",
+        "body": "font-normal text-lg"
+    },
+    spacing="flowing, natural spacing",
+    animations="smooth, flowing transitions",
+    characteristics=[
+        "Curved, organic shapes",
+        "Fluid layouts",
+        "Soft color gradients",
+        "Natural flow",
+        "Smooth animations",
+        "Asymmetric balance"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#2dd4bf",
+            "secondary": "#93c5fd",
+            "accent": "#c084fc"
+        }
+    },
+    prompt_additions="""
 **Organic Fluid Style Guidelines:**
 - Use curved, organic shapes (rounded-3xl or custom SVG shapes)
 - Implement fluid, flowing layouts
@@ -275,36 +280,37 @@ class DesignStyleLibrary:
 - Use soft shadows for depth
 - Create a calming, natural aesthetic
 """
-        )
-        
-        # Retro/Nostalgic
-        self.styles["retro_nostalgic"] = DesignStyle(
-            name="Retro/Nostalgic",
-            description="Retro elements with playful geometric shapes",
-            color_palette=["orange-400", "yellow-300", "pink-400", "teal-500"],
-            typography={
-                "heading": "font-bold text-5xl md:text-6xl",
-                "subheading": "font-semibold text-2xl md:text-3xl",
-                "body": "font-normal text-lg"
-            },
-            spacing="playful, varied spacing",
-            animations="bouncy, playful transitions",
-            characteristics=[
-                "Retro color palettes",
-                "Geometric shapes",
-                "Playful elements",
-                "Vintage typography",
-                "Nostalgic feel",
-                "Fun patterns"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#fb923c",
-                    "secondary": "#fde047",
-                    "accent": "#f472b6"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Retro/Nostalgic
+_RETRO_NOSTALGIC_SPEC: Dict[str, Any] = dict(
+    name="Retro/Nostalgic",
+    description="Retro elements with playful geometric shapes",
+    color_palette=["orange-400", "yellow-300", "pink-400", "teal-500"],
+    typography={
+        "heading": "font-bold text-5xl md:text-6xl",
+        "subheading": "font-semibold text-2xl md:text-3xl",
+        "body": "font-normal text-lg"
+    },
+    spacing="playful, varied spacing",
+    animations="bouncy, playful transitions",
+    characteristics=[
+        "Retro color palettes",
+        "Geometric shapes",
+        "Playful elements",
+        "Vintage typography",
+        "Nostalgic feel",
+        "Fun patterns"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#fb923c",
+            "secondary": "#fde047",
+            "accent": "#f472b6"
+        }
+    },
+    prompt_additions="""
 **Retro/Nostalgic Style Guidelines:**
 - Use retro color palettes (warm oranges, yellows, pinks)
 - Add playful geometric shapes and patterns
@@ -316,36 +322,37 @@ class DesignStyleLibrary:
 - Use warm, inviting colors
 - Create a friendly, approachable feel
 """
-        )
-        
-        # Experimental
-        self.styles["experimental"] = DesignStyle(
-            name="Experimental",
-            description="Experimental navigation with dynamic typography",
-            color_palette=["indigo-600", "violet-500", "fuchsia-500", "cyan-400"],
-            typography={
-                "heading": "font-black text-6xl md:text-8xl",
-                "subheading": "font-bold text-3xl md:text-4xl",
-                "body": "font-medium text-lg"
-            },
-            spacing="dynamic, unconventional spacing",
-            animations="complex, creative animations",
-            characteristics=[
-                "Experimental navigation",
-                "Dynamic typography",
-                "Non-traditional scrolling",
-                "Interactive elements",
-                "Cutting-edge design",
-                "Unique interactions"
-            ],
-            tailwind_config={
-                "colors": {
-                    "primary": "#4f46e5",
-                    "secondary": "#8b5cf6",
-                    "accent": "#22d3ee"
-                }
-            },
-            prompt_additions="""
+)
+
+
+# Experimental
+_EXPERIMENTAL_SPEC: Dict[str, Any] = dict(
+    name="Experimental",
+    description="Experimental navigation with dynamic typography",
+    color_palette=["indigo-600", "violet-500", "fuchsia-500", "cyan-400"],
+    typography={
+        "heading": "font-black text-6xl md:text-8xl",
+        "subheading": "font-bold text-3xl md:text-4xl",
+        "body": "font-medium text-lg"
+    },
+    spacing="dynamic, unconventional spacing",
+    animations="complex, creative animations",
+    characteristics=[
+        "Experimental navigation",
+        "Dynamic typography",
+        "Non-traditional scrolling",
+        "Interactive elements",
+        "Cutting-edge design",
+        "Unique interactions"
+    ],
+    tailwind_config={
+        "colors": {
+            "primary": "#4f46e5",
+            "secondary": "#8b5cf6",
+            "accent": "#22d3ee"
+        }
+    },
+    prompt_additions="""
 **Experimental Style Guidelines:**
 - Create experimental, non-traditional navigation
 - Use dynamic, animated typography
@@ -358,7 +365,33 @@ class DesignStyleLibrary:
 - Push creative boundaries
 - Use bold, futuristic color combinations
 """
-        )
+)
+
+
+class DesignStyleLibrary:
+    """Library of design styles."""
+    
+    def __init__(self):
+        """Initialize design style library."""
+        self.styles: Dict[str, DesignStyle] = {}
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._load_styles()
+        
+        # Styles keyed by the raw requested name; bounded because names come from user input
+        self._style_by_name = lru_cache(maxsize=64)(self._resolve_style)
+    
+    def _load_styles(self):
+        """Register all design style specifications; models are built on first use."""
+        self._specs["bold_minimalism"] = _BOLD_MINIMALISM_SPEC
+        self._specs["brutalism"] = _BRUTALISM_SPEC
+        self._specs["flat_minimalist"] = _FLAT_MINIMALIST_SPEC
+        self._specs["anti_design"] = _ANTI_DESIGN_SPEC
+        self._specs["vibrant_blocks"] = _VIBRANT_BLOCKS_SPEC
+        self._specs["organic_fluid"] = _ORGANIC_FLUID_SPEC
+        self._specs["retro_nostalgic"] = _RETRO_NOSTALGIC_SPEC
+        self._specs["experimental"] = _EXPERIMENTAL_SPEC
+        
+        self._style_names: Tuple[str, ...] = tuple(spec["name"] for spec in self._specs.values())
     
     def get_style(self, style_name: str) -> DesignStyle:
         """
@@ -370,23 +403,36 @@ class DesignStyleLibrary:
         Returns:
             DesignStyle object or default style
         """
-        style_key = style_name.lower().replace(" ", "_").replace("/", "_").replace("-", "_")
-        return self.styles.get(style_key, self.styles["bold_minimalism"])
+        return self._style_by_name(style_name)
+    
+    def _resolve_style(self, style_name: str) -> DesignStyle:
+        """Normalize a style name and build its DesignStyle on first use."""
+        style_key = style_name.lower().translate(_STYLE_KEY_SEPARATORS)
+        if style_key not in self._specs:
+            style_key = "bold_minimalism"
+        
+        style = self.styles.get(style_key)
+        if style is None:
+            spec = self._specs[style_key]
+            style = self.styles[style_key] = DesignStyle(
+                **{field: freeze(value) for field, value in spec.items()}
+            )
+        return style
     
     def list_styles(self) -> List[str]:
         """List all available design style names."""
-        return [style.name for style in self.styles.values()]
+        return list(self._style_names)
     
     def get_style_prompt_addition(self, style_name: str) -> str:
         """Get prompt additions for a specific design style."""
-        style = self.get_style(style_name)
-        return style.prompt_additions
+        return self._style_by_name(style_name).prompt_additions
     
-    def get_tailwind_config(self, style_name: str) -> Dict[str, Any]:
+    def get_tailwind_config(self, style_name: str) -> Mapping[str, Any]:
         """Get Tailwind configuration for a specific design style."""
-        style = self.get_style(style_name)
-        return style.tailwind_config
+        return self._style_by_name(style_name).tailwind_config
 
 
-# Global design style library instance
-design_style_library = DesignStyleLibrary()
+@lru_cache(maxsize=None)
+def get_design_style_library() -> DesignStyleLibrary:
+    """Get the shared design style library, creating it on first use."""
+    return DesignStyleLibrary()
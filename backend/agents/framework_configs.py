@@ -4,9 +4,15 @@ Framework-specific deployment configurations for Vercel.
 This module provides build settings and configurations for different
 frontend frameworks including React, Vue, Next.js, and Svelte.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Collection, Mapping, Tuple
+from types import MappingProxyType
 from enum import Enum
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from functools import lru_cache
+import orjson
+import re
+
+from utils.immutable import freeze
 
 
 class Framework(str, Enum):
@@ -18,19 +24,100 @@ class Framework(str, Enum):
     SVELTE = "svelte"
 
 
-class FrameworkBuildConfig(BaseModel):
-    """Build configuration for a framework."""
+@dataclass(frozen=True, slots=True)
+class FrameworkBuildConfig:
+    """Build configuration for a framework (read-only, defined once as a module constant)."""
     framework: Framework
-    build_command: str = Field(..., description="Command to build the project")
-    output_directory: str = Field(..., description="Directory containing build output")
-    install_command: str = Field(default="npm install", description="Command to install dependencies")
-    dev_command: Optional[str] = Field(None, description="Command to run dev server")
-    environment_variables: Dict[str, str] = Field(default_factory=dict, description="Default environment variables")
-    vercel_config: Dict[str, Any] = Field(default_factory=dict, description="Vercel-specific configuration")
-    required_files: List[str] = Field(default_factory=list, description="Required files for deployment")
+    build_command: str  # Command to build the project
+    output_directory: str  # Directory containing build output
+    install_command: str = "npm install"  # Command to install dependencies
+    dev_command: Optional[str] = None  # Command to run dev server
+    environment_variables: Mapping[str, str] = field(default_factory=dict)  # Default environment variables
+    vercel_config: Mapping[str, Any] = field(default_factory=dict)  # Vercel-specific configuration
+    required_files: Tuple[str, ...] = ()  # Required files for deployment
     
-    class Config:
-        use_enum_values = True
+    def __post_init__(self):
+        # Configs are shared module constants, so nested containers are made read-only
+        object.__setattr__(self, "environment_variables", freeze(self.environment_variables))
+        object.__setattr__(self, "vercel_config", freeze(self.vercel_config))
+        object.__setattr__(self, "required_files", tuple(self.required_files))
+
+
+# Security headers shared by every framework deployment
+_SECURITY_HEADERS = freeze((
+    {
+        "source": "/(.*)",
+        "headers": (
+            {
+                "key": "X-Content-Type-Options",
+                "value": "nosniff"
+            },
+            {
+                "key": "X-Frame-Options",
+                "value": "DENY"
+            },
+            {
+                "key": "X-XSS-Protection",
+                "value": "1; mode=block"
+            },
+        )
+    },
+))
+
+# SPA fallback routing: paths without a file extension are served the app shell
+_SPA_ROUTES = freeze((
+    {
+        "src": "/[^.]+",
+        "dest": "/",
+        "status": 200
+    },
+))
+
+
+# Frameworks deployed as static files, without build settings
+_NO_BUILD_FRAMEWORKS = frozenset({Framework.VANILLA})
+
+# Compiled SPA fallback source; Vercel anchors route sources, so it is matched in full
+_SPA_SRC_RE = re.compile(_SPA_ROUTES[0]["src"])
+
+# Commands and paths repeated across the configs below
+_NPM_INSTALL = "npm install"
+_NPM_BUILD = "npm run build"
+_NPM_DEV = "npm run dev"
+_VITE = "vite"
+_DIST = "dist"
+
+
+# Default environment shared by every framework that has a build step
+_PRODUCTION_ENV = freeze({
+    "NODE_ENV": "production",
+})
+
+# Vercel settings shared by the Vite-built single-page app frameworks
+_SPA_VERCEL_CONFIG = freeze({
+    "framework": _VITE,
+    "buildCommand": _NPM_BUILD,
+    "outputDirectory": _DIST,
+    "installCommand": _NPM_INSTALL,
+    "devCommand": _NPM_DEV,
+    # SPA routing configuration (React Router, Vue Router, SvelteKit)
+    "routes": _SPA_ROUTES,
+    "headers": _SECURITY_HEADERS,
+})
+
+
+def _make_spa_config(framework: Framework, required_files: Tuple[str, ...]) -> FrameworkBuildConfig:
+    """Build the config for a Vite-built SPA framework from the shared template."""
+    return FrameworkBuildConfig(
+        framework=framework,
+        build_command=_NPM_BUILD,
+        output_directory=_DIST,
+        install_command=_NPM_INSTALL,
+        dev_command=_NPM_DEV,
+        environment_variables=_PRODUCTION_ENV,
+        required_files=required_files,
+        vercel_config=_SPA_VERCEL_CONFIG,
+    )
 
 
 # Framework-specific configurations
@@ -41,187 +128,35 @@ FRAMEWORK_CONFIGS: Dict[Framework, FrameworkBuildConfig] = {
         output_directory=".",
         install_command="",
         dev_command="",
-        required_files=["index.html"],
+        required_files=("index.html",),
         vercel_config={
             "framework": None,  # Static site
         }
     ),
     
-    Framework.REACT: FrameworkBuildConfig(
-        framework=Framework.REACT,
-        build_command="npm run build",
-        output_directory="dist",
-        install_command="npm install",
-        dev_command="npm run dev",
-        environment_variables={
-            "NODE_ENV": "production",
-        },
-        required_files=["package.json", "index.html"],
-        vercel_config={
-            "framework": "vite",
-            "buildCommand": "npm run build",
-            "outputDirectory": "dist",
-            "installCommand": "npm install",
-            "devCommand": "npm run dev",
-            # SPA routing configuration
-            "routes": [
-                {
-                    "src": "/[^.]+",
-                    "dest": "/",
-                    "status": 200
-                }
-            ],
-            "headers": [
-                {
-                    "source": "/(.*)",
-                    "headers": [
-                        {
-                            "key": "X-Content-Type-Options",
-                            "value": "nosniff"
-                        },
-                        {
-                            "key": "X-Frame-Options",
-                            "value": "DENY"
-                        },
-                        {
-                            "key": "X-XSS-Protection",
-                            "value": "1; mode=block"
-                        }
-                    ]
-                }
-            ]
-        }
-    ),
+    Framework.REACT: _make_spa_config(Framework.REACT, ("package.json", "index.html")),
     
-    Framework.VUE: FrameworkBuildConfig(
-        framework=Framework.VUE,
-        build_command="npm run build",
-        output_directory="dist",
-        install_command="npm install",
-        dev_command="npm run dev",
-        environment_variables={
-            "NODE_ENV": "production",
-        },
-        required_files=["package.json", "index.html"],
-        vercel_config={
-            "framework": "vite",
-            "buildCommand": "npm run build",
-            "outputDirectory": "dist",
-            "installCommand": "npm install",
-            "devCommand": "npm run dev",
-            # SPA routing configuration for Vue Router
-            "routes": [
-                {
-                    "src": "/[^.]+",
-                    "dest": "/",
-                    "status": 200
-                }
-            ],
-            "headers": [
-                {
-                    "source": "/(.*)",
-                    "headers": [
-                        {
-                            "key": "X-Content-Type-Options",
-                            "value": "nosniff"
-                        },
-                        {
-                            "key": "X-Frame-Options",
-                            "value": "DENY"
-                        },
-                        {
-                            "key": "X-XSS-Protection",
-                            "value": "1; mode=block"
-                        }
-                    ]
-                }
-            ]
-        }
-    ),
+    Framework.VUE: _make_spa_config(Framework.VUE, ("package.json", "index.html")),
     
     Framework.NEXTJS: FrameworkBuildConfig(
         framework=Framework.NEXTJS,
         build_command="next build",
         output_directory=".next",
-        install_command="npm install",
+        install_command=_NPM_INSTALL,
         dev_command="next dev",
-        environment_variables={
-            "NODE_ENV": "production",
-        },
-        required_files=["package.json", "next.config.js"],
+        environment_variables=_PRODUCTION_ENV,
+        required_files=("package.json", "next.config.js"),
         vercel_config={
             "framework": "nextjs",
             "buildCommand": "next build",
-            "installCommand": "npm install",
+            "installCommand": _NPM_INSTALL,
             "devCommand": "next dev",
             # Next.js has native Vercel support, no custom routing needed
-            "headers": [
-                {
-                    "source": "/(.*)",
-                    "headers": [
-                        {
-                            "key": "X-Content-Type-Options",
-                            "value": "nosniff"
-                        },
-                        {
-                            "key": "X-Frame-Options",
-                            "value": "DENY"
-                        },
-                        {
-                            "key": "X-XSS-Protection",
-                            "value": "1; mode=block"
-                        }
-                    ]
-                }
-            ]
+            "headers": _SECURITY_HEADERS,
         }
     ),
     
-    Framework.SVELTE: FrameworkBuildConfig(
-        framework=Framework.SVELTE,
-        build_command="npm run build",
-        output_directory="dist",
-        install_command="npm install",
-        dev_command="npm run dev",
-        environment_variables={
-            "NODE_ENV": "production",
-        },
-        required_files=["package.json"],
-        vercel_config={
-            "framework": "vite",
-            "buildCommand": "npm run build",
-            "outputDirectory": "dist",
-            "installCommand": "npm install",
-            "devCommand": "npm run dev",
-            # SPA routing configuration for SvelteKit
-            "routes": [
-                {
-                    "src": "/[^.]+",
-                    "dest": "/",
-                    "status": 200
-                }
-            ],
-            "headers": [
-                {
-                    "source": "/(.*)",
-                    "headers": [
-                        {
-                            "key": "X-Content-Type-Options",
-                            "value": "nosniff"
-                        },
-                        {
-                            "key": "X-Frame-Options",
-                            "value": "DENY"
-                        },
-                        {
-                            "key": "X-XSS-Protection",
-                            "value": "1; mode=block"
-                        }
-                    ]
-                }
-            ]
-        }
-    ),
+    Framework.SVELTE: _make_spa_config(Framework.SVELTE, ("package.json",)),
 }
 
 
@@ -238,25 +173,19 @@ def get_framework_config(framework: Framework) -> FrameworkBuildConfig:
     Raises:
         ValueError: If framework is not supported
     """
-    if framework not in FRAMEWORK_CONFIGS:
+    config = FRAMEWORK_CONFIGS.get(framework)
+    if config is None:
         raise ValueError(f"Unsupported framework: {framework}")
     
-    return FRAMEWORK_CONFIGS[framework]
+    return config
 
 
-def get_vercel_project_settings(
-    framework: Framework,
-    environment_variables: Optional[Dict[str, str]] = None
-) -> Dict[str, Any]:
+@lru_cache(maxsize=None)
+def _project_settings_base(framework: Framework) -> Mapping[str, Any]:
     """
-    Get Vercel project settings for a framework.
+    Build the environment-independent part of a framework's project settings.
     
-    Args:
-        framework: Framework enum value
-        environment_variables: Additional environment variables to include
-        
-    Returns:
-        Dictionary of Vercel project settings
+    The result is cached and shared, so it is returned as a read-only mapping.
     """
     config = get_framework_config(framework)
     
@@ -265,45 +194,72 @@ def get_vercel_project_settings(
         "framework": config.vercel_config.get("framework"),
     }
     
-    # Add build settings if not vanilla
-    if framework != Framework.VANILLA:
+    # Add build settings for frameworks with a build step
+    if framework not in _NO_BUILD_FRAMEWORKS:
         settings["buildCommand"] = config.build_command
         settings["outputDirectory"] = config.output_directory
         settings["installCommand"] = config.install_command
         settings["devCommand"] = config.dev_command
     
-    # Merge environment variables
-    env_vars = {**config.environment_variables}
-    if environment_variables:
-        env_vars.update(environment_variables)
-    
-    if env_vars:
-        # Convert to Vercel environment variable format
-        settings["env"] = [
-            {
-                "key": key,
-                "value": value,
-                "target": ["production", "preview", "development"]
-            }
-            for key, value in env_vars.items()
-        ]
-    
-    return settings
+    return MappingProxyType(settings)
+
 
+# Vercel environments every environment variable is applied to
+_TARGETS = ("production", "preview", "development")
 
-def get_vercel_config_json(framework: Framework) -> Dict[str, Any]:
+
+def _build_env_list(env_vars: Mapping[str, str]) -> Tuple[Mapping[str, Any], ...]:
     """
-    Get vercel.json configuration for a framework.
+    Convert environment variables to Vercel's format, as read-only entries.
     
-    This configuration is used for routing and other deployment settings.
+    Entries are built per call and never cached, since user-supplied values
+    can be secrets; only the shared ``_TARGETS`` tuple is reused.
+    """
+    return tuple(
+        MappingProxyType({"key": key, "value": value, "target": _TARGETS})
+        for key, value in env_vars.items()
+    )
+
+
+# Vercel env entries for each framework's own defaults, which hold no user values
+_DEFAULT_ENV_LISTS: Dict[Framework, Tuple[Mapping[str, Any], ...]] = {
+    framework: _build_env_list(config.environment_variables)
+    for framework, config in FRAMEWORK_CONFIGS.items()
+}
+
+
+def get_vercel_project_settings(
+    framework: Framework,
+    environment_variables: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Get Vercel project settings for a framework.
     
     Args:
         framework: Framework enum value
+        environment_variables: Additional environment variables to include
         
     Returns:
-        Dictionary representing vercel.json content
+        Dictionary of Vercel project settings; the "env" entries are shared and read-only
     """
     config = get_framework_config(framework)
+    settings = dict(_project_settings_base(framework))
+    
+    # Merge environment variables; without overrides the shared default entries are used as-is
+    if environment_variables:
+        env_list = _build_env_list({**config.environment_variables, **environment_variables})
+    else:
+        env_list = _DEFAULT_ENV_LISTS[framework]
+    
+    if env_list:
+        settings["env"] = env_list
+    
+    return settings
+
+
+def _build_vercel_config_json(framework: Framework) -> Mapping[str, Any]:
+    """Build the read-only vercel.json content for a framework."""
+    config = get_framework_config(framework)
     
     vercel_json = {}
     
@@ -315,32 +271,116 @@ def get_vercel_config_json(framework: Framework) -> Dict[str, Any]:
     if "headers" in config.vercel_config:
         vercel_json["headers"] = config.vercel_config["headers"]
     
-    # Add build configuration for non-vanilla frameworks
-    if framework != Framework.VANILLA:
+    # Add build configuration for frameworks with a build step
+    if framework not in _NO_BUILD_FRAMEWORKS:
         vercel_json["buildCommand"] = config.build_command
         vercel_json["outputDirectory"] = config.output_directory
         vercel_json["installCommand"] = config.install_command
     
+    return MappingProxyType(vercel_json)
+
+
+# vercel.json content per framework, built once at import
+_VERCEL_CONFIG_JSON: Dict[Framework, Mapping[str, Any]] = {
+    framework: _build_vercel_config_json(framework) for framework in FRAMEWORK_CONFIGS
+}
+
+
+def get_vercel_config_json(framework: Framework) -> Mapping[str, Any]:
+    """
+    Get vercel.json configuration for a framework.
+    
+    This configuration is used for routing and other deployment settings.
+    The result is precomputed and shared, so it is returned as a read-only mapping.
+    
+    Args:
+        framework: Framework enum value
+        
+    Returns:
+        Read-only mapping representing vercel.json content
+        
+    Raises:
+        ValueError: If framework is not supported
+    """
+    vercel_json = _VERCEL_CONFIG_JSON.get(framework)
+    if vercel_json is None:
+        raise ValueError(f"Unsupported framework: {framework}")
+    
+    return vercel_json
+
+
+def is_spa_route(path: str, framework: Framework) -> bool:
+    """
+    Check whether a request path falls through to a framework's SPA app shell.
+    
+    Args:
+        path: Request path, e.g. "/about"
+        framework: Framework enum value
+        
+    Returns:
+        True if the framework's SPA fallback route serves the path
+        
+    Raises:
+        ValueError: If framework is not supported
+    """
+    config = get_framework_config(framework)
+    if "routes" not in config.vercel_config:
+        return False
+    
+    return _SPA_SRC_RE.fullmatch(path) is not None
+
+
+# Serialized vercel.json per framework, in the indented format written to deployments
+_VERCEL_CONFIG_JSON_BYTES: Dict[Framework, bytes] = {
+    framework: orjson.dumps(vercel_json, default=dict, option=orjson.OPT_INDENT_2)
+    for framework, vercel_json in _VERCEL_CONFIG_JSON.items()
+}
+
+
+def get_vercel_config_json_bytes(framework: Framework) -> bytes:
+    """
+    Get the serialized vercel.json file content for a framework.
+    
+    Args:
+        framework: Framework enum value
+        
+    Returns:
+        vercel.json content as UTF-8 JSON bytes, serialized once at import
+        
+    Raises:
+        ValueError: If framework is not supported
+    """
+    vercel_json = _VERCEL_CONFIG_JSON_BYTES.get(framework)
+    if vercel_json is None:
+        raise ValueError(f"Unsupported framework: {framework}")
+    
     return vercel_json
 
 
-def validate_framework_files(framework: Framework, files: List[str]) -> tuple[bool, List[str]]:
+# Required files per framework as frozensets for C-level set difference
+_REQUIRED_FILE_SETS: Dict[Framework, frozenset] = {
+    framework: frozenset(config.required_files) for framework, config in FRAMEWORK_CONFIGS.items()
+}
+
+
+def validate_framework_files(framework: Framework, files: Collection[str]) -> tuple[bool, List[str]]:
     """
     Validate that required files are present for a framework.
     
     Args:
         framework: Framework enum value
-        files: List of file paths in the deployment
+        files: File paths in the deployment
         
     Returns:
         Tuple of (is_valid, missing_files)
     """
     config = get_framework_config(framework)
-    missing_files = []
-    
-    for required_file in config.required_files:
-        if required_file not in files:
-            missing_files.append(required_file)
+    missing = _REQUIRED_FILE_SETS[framework].difference(files)
+    if not missing:
+        return True, []
     
-    is_valid = len(missing_files) == 0
-    return is_valid, missing_files
+    # Report missing files in the order the framework declares them
+    missing_files = [
+        required_file for required_file in config.required_files if required_file in missing
+    ]
+    return False, missing_files
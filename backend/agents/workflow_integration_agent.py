@@ -104,6 +104,13 @@ class WorkflowIntegrationOutput(AgentOutput):
     integrated_html: Optional[str] = Field(None, description="Full HTML with integration applied")
 
 
+# Static setup instructions for the React contact form, built once and shared read-only
+_REACT_CONTACT_SETUP_INSTRUCTIONS = SetupInstructions(
+    steps=["Install react-hook-form", "Create backend API endpoint", "Configure SMTP"],
+    environment_variables=["SMTP_HOST", "SMTP_PORT", "SMTP_USERNAME", "SMTP_PASSWORD"]
+)
+
+
 class WorkflowIntegrationAgent(BaseAgent):
     """
     Workflow Integration Agent for third-party services.
@@ -2185,9 +2192,9 @@ document.getElementById('smtp-contact-form').addEventListener('submit', async fu
         config = input_data.config
         title = config.get("title", "Contact Us")
         
-        html_snippet = f"""// ContactForm.tsx - React component with react-hook-form validation
+        html_snippet = """// ContactForm.tsx - React component with react-hook-form validation
 // See full implementation in documentation
-import {{ useForm }} from 'react-hook-form';
+import { useForm } from 'react-hook-form';
 // Component implementation with validation, error handling, and API integration
 """
         
@@ -2198,10 +2205,7 @@ import {{ useForm }} from 'react-hook-form';
                 html_snippet=html_snippet,
                 dependencies=["react-hook-form"]
             ),
-            setup_instructions=SetupInstructions(
-                steps=["Install react-hook-form", "Create backend API endpoint", "Configure SMTP"],
-                environment_variables=["SMTP_HOST", "SMTP_PORT", "SMTP_USERNAME", "SMTP_PASSWORD"]
-            ),
+            setup_instructions=_REACT_CONTACT_SETUP_INSTRUCTIONS,
             security_validation=SecurityValidation(),
             config=config
         )
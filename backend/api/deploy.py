@@ -195,6 +195,9 @@ async def deploy_site(req: DeployRequest, background_tasks: BackgroundTasks):
         
         result = await deployment_agent.execute_with_metrics(input_data, context)
         
+        # Finish the deployment record write after the response is sent
+        background_tasks.add_task(context.wait_for_background_tasks)
+        
         if not result.success:
             await websocket_manager.send_workflow_update(
                 workflow_id,
@@ -437,7 +440,7 @@ async def get_deployment_task_status(task_id: str):
 
 
 @router.post("/rollback/{site_id}")
-async def rollback_deployment(site_id: str, deployment_id: str):
+async def rollback_deployment(site_id: str, deployment_id: str, background_tasks: BackgroundTasks):
     """
     Rollback to a previous deployment.
     
@@ -447,6 +450,7 @@ async def rollback_deployment(site_id: str, deployment_id: str):
     Args:
         site_id: Site ID
         deployment_id: Deployment ID to rollback to
+        background_tasks: FastAPI background tasks
         
     Returns:
         DeploymentResponse with new deployment information
@@ -511,6 +515,9 @@ async def rollback_deployment(site_id: str, deployment_id: str):
         
         result = await deployment_agent.execute_with_metrics(input_data, context)
         
+        # Finish the deployment record write after the response is sent
+        background_tasks.add_task(context.wait_for_background_tasks)
+        
         if not result.success:
             raise HTTPException(
                 status_code=500,
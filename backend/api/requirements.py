@@ -301,8 +301,8 @@ async def get_conversation_history(session_id: str):
                 detail="Invalid session_id format. Must be a valid UUID."
             )
         
-        # Load conversation history from Redis
-        history = input_agent._load_conversation_history(session_id)
+        # Load the full stored conversation history from Redis
+        history = await input_agent._load_conversation_history(session_id, limit=None)
         
         if history is None:
             return {
@@ -348,9 +348,8 @@ async def clear_conversation_history(session_id: str):
                 detail="Invalid session_id format. Must be a valid UUID."
             )
         
-        # Clear conversation history from Redis
-        key = f"conversation:{session_id}"
-        input_agent.redis.delete(key)
+        # Clear conversation history and the requirements stored beside it from Redis
+        await input_agent._clear_session(session_id)
         
         logger.info(f"Cleared conversation history for session {session_id}")
         
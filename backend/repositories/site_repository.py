@@ -403,6 +403,28 @@ class SiteRepository:
             logger.error(f"Error saving deployment: {str(e)}")
             raise
     
+    def save_deployments_bulk(self, deployments: List[Deployment]) -> List[Deployment]:
+        """
+        Save several deployment records in a single transaction.
+        
+        Args:
+            deployments: Deployments to save
+            
+        Returns:
+            Saved deployments
+        """
+        try:
+            with self._get_db_context() as db:
+                db.add_all(deployments)
+                db.flush()
+                if not self.db:
+                    db.commit()
+                logger.info(f"Saved {len(deployments)} deployment records")
+                return deployments
+        except Exception as e:
+            logger.error(f"Error saving deployments: {str(e)}")
+            raise
+    
     def _create_framework_change(
         self,
         db: DBSession,
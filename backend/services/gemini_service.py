@@ -43,7 +43,8 @@ class GeminiService:
             if max_tokens:
                 generation_config["max_output_tokens"] = max_tokens
             
-            response = self.model.generate_content(
+            # The async client keeps the event loop free while Gemini responds
+            response = await self.model.generate_content_async(
                 prompt,
                 generation_config=generation_config,
             )
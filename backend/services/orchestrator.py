@@ -400,10 +400,10 @@ class AgentOrchestrator:
         self.workflows[workflow_id] = state
         self._save_workflow_state_to_redis(state)
         
+        # Create agent context
+        context = self.create_context(session_id, workflow_id, user_preferences)
+        
         try:
-            # Create agent context
-            context = self.create_context(session_id, workflow_id, user_preferences)
-            
             # Execute workflow based on type
             if workflow_type == WorkflowType.CREATE_SITE:
                 result = await self._execute_create_site_workflow(input_data, context, state)
@@ -464,6 +464,10 @@ class AgentOrchestrator:
                 "error": str(e),
                 "metrics": state.metrics.to_dict(),
             }
+        
+        finally:
+            # Let background writes (e.g. deployment records) finish before the workflow ends
+            await context.wait_for_background_tasks()
     
     async def _execute_agent_with_retry(
         self,
@@ -2,14 +2,19 @@
 Redis service for caching and session management.
 """
 import redis
-import json
-from typing import Any, Optional
+import orjson
+from typing import Any, List, Optional
 from datetime import timedelta
 
 from utils.config import settings
 from utils.logging import logger
 
 
+# orjson encodes straight to bytes, which redis-py sends without re-encoding;
+# non-string dict keys are stringified as the stdlib json module did
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
 class RedisService:
     """Redis service for caching and session management."""
     
@@ -35,7 +40,7 @@ class RedisService:
         try:
             value = self.client.get(key)
             if value:
-                return json.loads(value)
+                return orjson.loads(value)
             return None
         except Exception as e:
             logger.error(f"Redis GET error for key {key}: {str(e)}")
@@ -59,7 +64,7 @@ class RedisService:
             True if successful, False otherwise
         """
         try:
-            serialized = json.dumps(value)
+            serialized = orjson.dumps(value, option=_JSON_OPTIONS)
             if ttl:
                 self.client.setex(key, ttl, serialized)
             else:
@@ -69,23 +74,78 @@ class RedisService:
             logger.error(f"Redis SET error for key {key}: {str(e)}")
             return False
     
-    def delete(self, key: str) -> bool:
+    def delete(self, *keys: str) -> bool:
         """
-        Delete key from Redis.
+        Delete one or more keys from Redis in a single command.
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.client.delete(*keys)
+            return True
+        except Exception as e:
+            logger.error(f"Redis DELETE error for keys {', '.join(keys)}: {str(e)}")
+            return False
+    
+    def push_to_list(
+        self,
+        key: str,
+        values: List[Any],
+        max_length: Optional[int] = None,
+        ttl: Optional[int] = None,
+        replace: bool = False,
+    ) -> bool:
+        """
+        Append values to a Redis list in a single pipelined round trip.
         
         Args:
             key: Redis key
+            values: Values to append
+            max_length: Keep only this many most recent items
+            ttl: Time to live in seconds
+            replace: Drop the existing list (or a non-list value) first
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            self.client.delete(key)
+            pipe = self.client.pipeline()
+            if replace:
+                pipe.delete(key)
+            if values:
+                pipe.rpush(key, *(orjson.dumps(value, option=_JSON_OPTIONS) for value in values))
+            if max_length:
+                pipe.ltrim(key, -max_length, -1)
+            if ttl:
+                pipe.expire(key, ttl)
+            pipe.execute()
             return True
         except Exception as e:
-            logger.error(f"Redis DELETE error for key {key}: {str(e)}")
+            logger.error(f"Redis RPUSH error for key {key}: {str(e)}")
             return False
     
+    def get_list_tail(self, key: str, count: Optional[int] = None) -> Optional[List[Any]]:
+        """
+        Get the last items of a Redis list.
+        
+        Args:
+            key: Redis key
+            count: Number of most recent items to return (all items if None)
+            
+        Returns:
+            Items in insertion order, or None on error
+        """
+        try:
+            start = -count if count else 0
+            return [orjson.loads(value) for value in self.client.lrange(key, start, -1)]
+        except Exception as e:
+            logger.error(f"Redis LRANGE error for key {key}: {str(e)}")
+            return None
+    
     def exists(self, key: str) -> bool:
         """
         Check if key exists in Redis.
@@ -10,6 +10,7 @@ This client provides a wrapper around the Vercel REST API for:
 import httpx
 import asyncio
 import time
+import orjson
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -224,9 +225,10 @@ class VercelClient:
         try:
             logger.info(f"Updating Vercel project: {project_id}")
             
+            # orjson serializes the read-only mappings shared by framework settings
             response = await self.client.patch(
                 f"/{self.API_VERSION}/projects/{project_id}",
-                json=settings
+                content=orjson.dumps(settings, default=dict)
             )
             
             response.raise_for_status()
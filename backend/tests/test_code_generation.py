@@ -0,0 +1,139 @@
+import pytest
+from agents.code_generation_agent import CodeGenerationAgent
+
+VALID_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="description" content="A test site">
+    <title>Test Site</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+</head>
+<body>
+    <nav class="flex">Menu</nav>
+    <section class="md:grid-cols-2">Content</section>
+    <form><input type="email"></form>
+</body>
+</html>"""
+
+
+@pytest.fixture
+def agent():
+    return CodeGenerationAgent()
+
+
+def test_validate_vanilla_code_complete_page(agent):
+    validation = agent._validate_vanilla_code(VALID_HTML)
+
+    assert validation.is_valid_html is True
+    assert validation.has_title is True
+    assert validation.has_description is True
+    assert validation.has_viewport is True
+    assert validation.has_tailwind_cdn is True
+    assert validation.has_responsive_patterns is True
+    assert validation.validation_errors == []
+    assert validation.confidence_score == 1.0
+
+
+def test_validate_vanilla_code_missing_html_tag(agent):
+    validation = agent._validate_vanilla_code("<div>Just a fragment</div>")
+
+    assert validation.is_valid_html is False
+    assert "Missing <html> tag" in validation.validation_errors
+    assert validation.has_title is False
+
+
+def test_validate_modifications_detects_removed_features(agent):
+    new_code = "<html><head><title>Test</title></head><body><p>Gone</p></body></html>"
+
+    result = agent._validate_modifications(VALID_HTML, new_code)
+
+    assert "DOCTYPE declaration was removed" in result["warnings"]
+    assert "Tailwind CSS CDN was removed" in result["warnings"]
+    assert "Navigation element was removed" in result["warnings"]
+    assert "Some meta tags were removed (3 -> 0)" in result["warnings"]
+    assert "Some forms were removed (1 -> 0)" in result["warnings"]
+
+
+def test_validate_modifications_preserved_features(agent):
+    result = agent._validate_modifications(VALID_HTML, VALID_HTML)
+
+    assert result["is_valid"] is True
+    assert result["warnings"] == []
+
+
+def test_generate_diff_counts_changes(agent):
+    old_code = "line one\nline two\nline three\n"
+    new_code = "line one\nline 2\nline three\nline four\n"
+
+    diff = agent._generate_diff(old_code, new_code)
+
+    assert diff.added_lines == 2
+    assert diff.removed_lines == 1
+    assert diff.diff_summary == "Modified 3 lines (2 added, 1 removed)"
+    assert len(diff.modified_sections) >= 1
+
+
+def test_validate_react_code_markers(agent):
+    code = """import React, { useState } from 'react';
+const Items = ({ items }) => {
+    const [open, setOpen] = useState(false);
+    return (
+        <ul className="md:flex">{items.map(item => <li>{item}</li>)}</ul>
+    );
+};
+export default Items;"""
+
+    validation = agent._validate_react_code(code)
+
+    assert validation.has_responsive_patterns is True
+    assert validation.has_title is True
+    assert validation.has_description is True
+    assert validation.has_tailwind_cdn is True
+    assert "Missing key props in list rendering" in validation.validation_warnings
+
+
+def test_validate_vanilla_code_tags_outside_head(agent):
+    html = VALID_HTML.replace(
+        '    <script src="https://cdn.tailwindcss.com"></script>\n', ''
+    ).replace('</body>', '<script src="https://cdn.tailwindcss.com"></script>\n</body>')
+
+    validation = agent._validate_vanilla_code(html)
+
+    assert validation.has_tailwind_cdn is True
+    assert "Tailwind CSS CDN not found" not in validation.validation_warnings
+
+
+def test_validate_vanilla_code_reports_missing_meta(agent):
+    html = VALID_HTML.replace(
+        '    <meta name="description" content="A test site">\n', ''
+    )
+
+    validation = agent._validate_vanilla_code(html)
+
+    assert validation.has_description is False
+    assert validation.has_viewport is True
+    assert "Missing description meta tag" in validation.validation_warnings
+
+
+def test_generate_diff_counts_lines_starting_with_markers(agent):
+    old_code = "<style>\n-- a\n</style>\n"
+    new_code = "<style>\n++ b\n</style>\n"
+
+    diff = agent._generate_diff(old_code, new_code)
+
+    assert diff.added_lines == 1
+    assert diff.removed_lines == 1
+
+
+def test_generate_diff_limits_sections(agent):
+    old_code = "\n".join(f"line {i}" for i in range(100))
+    new_code = "\n".join(f"line {i}" if i % 10 else f"changed {i}" for i in range(100))
+
+    diff = agent._generate_diff(old_code, new_code)
+
+    assert diff.added_lines == 10
+    assert diff.removed_lines == 10
+    assert len(diff.modified_sections) == 5
+    assert diff.modified_sections[0] == "@@ -1,1 +1,1 @@\n-line 0\n+changed 0\n"
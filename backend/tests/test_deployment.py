@@ -0,0 +1,338 @@
+import asyncio
+import pytest
+import orjson
+from dataclasses import FrozenInstanceError
+from pydantic import ValidationError
+from agents.base_agent import AgentContext, AgentError
+from agents.deployment_agent import (
+    DeploymentAgent,
+    DeploymentMetadata,
+    DeploymentOutput,
+    _DeploymentWriter,
+    _HealthCheckWindow,
+)
+from agents.framework_configs import (
+    Framework,
+    get_framework_config,
+    get_vercel_config_json,
+    get_vercel_config_json_bytes,
+    get_vercel_project_settings,
+    is_spa_route,
+)
+
+VALID_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <title>Test Site</title>
+</head>
+<body>
+    <h1>Welcome to the test site</h1>
+</body>
+</html>"""
+
+
+@pytest.fixture
+def agent():
+    return DeploymentAgent()
+
+
+def test_validate_html_complete_page(agent):
+    validation = agent._validate_html(VALID_HTML)
+
+    assert validation.is_valid_html is True
+    assert validation.has_content is True
+    assert validation.has_doctype is True
+    assert validation.has_html_tag is True
+    assert validation.has_head is True
+    assert validation.has_body is True
+    assert validation.validation_warnings == []
+    assert validation.confidence_score == 1.0
+
+
+def test_validate_html_missing_structure(agent):
+    validation = agent._validate_html("<p>Just a paragraph of text</p>")
+
+    assert validation.is_valid_html is False
+    assert validation.has_doctype is False
+    assert "Missing <html> tag" in validation.validation_errors
+    assert "Missing <body> tag" in validation.validation_errors
+    assert "Missing <head> tag" in validation.validation_warnings
+
+
+def test_validate_html_empty_body(agent):
+    validation = agent._validate_html(
+        "<!doctype html><html><head></head><body><div>  <span>Hi</span> </div></body></html>"
+    )
+
+    assert validation.is_valid_html is True
+    assert "Body has very little content" in validation.validation_warnings
+
+
+@pytest.mark.parametrize("body", [
+    "<script>var x = 12345678901;</script>",
+    "<style>body { color: #123456; }</style>",
+    "<template><p>Hidden template text</p></template>",
+])
+def test_validate_html_ignores_non_text_body_content(agent, monkeypatch, body):
+    html = f"<!doctype html><html><head></head><body>{body}</body></html>"
+    default_validation = agent._validate_html(html)
+
+    monkeypatch.setattr("agents.deployment_agent.settings.STRICT_HTML_VALIDATION", True)
+    strict_validation = agent._validate_html(html)
+
+    for validation in (default_validation, strict_validation):
+        assert validation.is_valid_html is True
+        assert "Body has very little content" in validation.validation_warnings
+
+
+def test_validate_html_empty(agent):
+    validation = agent._validate_html("   ")
+
+    assert validation.is_valid_html is False
+    assert validation.validation_errors == ["HTML code is empty"]
+
+
+def test_sanitize_site_name(agent):
+    assert agent._sanitize_site_name("My Cool_Site!!") == "my-cool-site"
+    assert agent._sanitize_site_name("--a  --  b--") == "a-b"
+    assert agent._sanitize_site_name("x" * 80) == "x" * 63
+    assert agent._sanitize_site_name("!!!").startswith("site-")
+
+
+def test_validate_html_strict_mode_matches_default(agent, monkeypatch):
+    html = "<!doctype html><html><head></head><body><div>  <span>Hi</span> </div></body></html>"
+    default_validation = agent._validate_html(html)
+
+    monkeypatch.setattr("agents.deployment_agent.settings.STRICT_HTML_VALIDATION", True)
+    strict_validation = agent._validate_html(html)
+
+    assert strict_validation.validation_warnings == default_validation.validation_warnings
+    assert strict_validation.confidence_score == default_validation.confidence_score
+
+
+def test_project_settings_do_not_share_cached_state():
+    settings = get_vercel_project_settings(Framework.REACT, {"API_URL": "https://api.example.com"})
+    settings["buildCommand"] = "changed"
+
+    fresh = get_vercel_project_settings(Framework.REACT)
+
+    assert fresh["buildCommand"] == "npm run build"
+    assert [env["key"] for env in fresh["env"]] == ["NODE_ENV"]
+
+
+def test_project_settings_env_entries_are_read_only_and_user_values_uncached():
+    first = get_vercel_project_settings(Framework.VUE, {"API_URL": "https://api.example.com"})
+    second = get_vercel_project_settings(Framework.VUE, {"API_URL": "https://api.example.com"})
+
+    assert first["env"] is not second["env"]
+    assert first["env"][1]["value"] == "https://api.example.com"
+    assert first["env"][0]["target"] is second["env"][0]["target"]
+    with pytest.raises(TypeError):
+        first["env"][0]["value"] = "development"
+    assert get_vercel_project_settings(Framework.VUE)["env"] is get_vercel_project_settings(Framework.VUE)["env"]
+
+
+def test_validate_html_doctype_is_case_insensitive(agent):
+    validation = agent._validate_html("\ufeff<!Doctype html>" + VALID_HTML.split("\n", 1)[1])
+
+    assert validation.has_doctype is True
+    assert "Missing DOCTYPE declaration" not in validation.validation_warnings
+
+
+def test_validate_html_strict_mode_ignores_head_text(agent, monkeypatch):
+    monkeypatch.setattr("agents.deployment_agent.settings.STRICT_HTML_VALIDATION", True)
+    html = "<!DOCTYPE html><html><head><title>A very long page title</title></head><body><p>Hi</p></body></html>"
+
+    validation = agent._validate_html(html)
+
+    assert "Body has very little content" in validation.validation_warnings
+
+
+def test_validate_html_ignores_text_after_body(agent):
+    html = "<!DOCTYPE html><html><head></head><body><p>Hi</p></body><p>Trailing text</p></html>"
+
+    validation = agent._validate_html(html)
+
+    assert "Body has very little content" in validation.validation_warnings
+
+
+@pytest.mark.asyncio
+async def test_newer_deployment_supersedes_in_flight_one(agent, monkeypatch):
+    async def fake_deploy(site_name, **kwargs):
+        await asyncio.sleep(0.05)
+        return site_name
+
+    monkeypatch.setattr(agent, "_deploy_to_vercel", fake_deploy)
+
+    first = asyncio.create_task(agent._deploy_latest("prj_1", site_name="first"))
+    await asyncio.sleep(0)
+    second = await agent._deploy_latest("prj_1", site_name="second")
+
+    assert second == "second"
+    with pytest.raises(AgentError, match="superseded"):
+        await first
+    assert agent._inflight == {}
+
+
+def test_deployment_supersession_works_across_event_loops(agent, monkeypatch):
+    async def fake_deploy(site_name, **kwargs):
+        await asyncio.sleep(0.01)
+        return site_name
+
+    monkeypatch.setattr(agent, "_deploy_to_vercel", fake_deploy)
+
+    async def deploy_repeatedly(name):
+        first = asyncio.create_task(agent._deploy_latest("prj_1", site_name=f"{name}-1"))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(
+            agent._deploy_latest("prj_1", site_name=f"{name}-2"),
+            agent._deploy_latest("prj_1", site_name=name),
+            return_exceptions=True,
+        )
+        await asyncio.gather(first, return_exceptions=True)
+        return results[-1]
+
+    # Celery tasks run each deployment in a fresh event loop via asyncio.run
+    assert asyncio.run(deploy_repeatedly("one")) == "one"
+    assert asyncio.run(deploy_repeatedly("two")) == "two"
+    assert agent._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_context_waits_for_background_tasks():
+    context = AgentContext(session_id="session", workflow_id="workflow")
+    finished = []
+
+    async def store():
+        await asyncio.sleep(0.01)
+        finished.append(True)
+
+    context.add_background_task(asyncio.create_task(store()))
+    await context.wait_for_background_tasks()
+
+    assert finished == [True]
+    assert "_background_tasks" not in context.model_dump()
+
+
+def test_deployment_metadata_is_immutable():
+    metadata = DeploymentMetadata(
+        url="https://example.vercel.app",
+        deployment_id="dpl_1",
+        project_id="prj_1",
+        project_name="example",
+    )
+
+    with pytest.raises(ValidationError):
+        metadata.url = "https://other.vercel.app"
+
+
+@pytest.mark.asyncio
+async def test_deployment_writer_batches_queued_records(monkeypatch):
+    batches = []
+    monkeypatch.setattr(
+        "agents.deployment_agent.site_repository.save_deployments_bulk",
+        lambda deployments: batches.append(list(deployments)),
+    )
+    writer = _DeploymentWriter()
+
+    await asyncio.gather(*(writer.enqueue(record) for record in ("a", "b", "c")))
+
+    assert batches == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_deployment_writer_isolates_failing_record(monkeypatch):
+    written = []
+
+    def save_deployments_bulk(deployments):
+        if "bad" in deployments:
+            raise ValueError("foreign key violation")
+        written.extend(deployments)
+
+    monkeypatch.setattr(
+        "agents.deployment_agent.site_repository.save_deployments_bulk",
+        save_deployments_bulk,
+    )
+    writer = _DeploymentWriter()
+
+    results = await asyncio.gather(
+        *(writer.enqueue(record) for record in ("a", "bad", "c")),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+    assert written == ["a", "c"]
+
+
+def test_validate_reports_metadata_problems(agent):
+    output = DeploymentOutput(
+        success=True,
+        deployment_metadata=DeploymentMetadata(
+            url="example.vercel.app",
+            deployment_id="",
+            project_id="",
+            project_name="example",
+        ),
+    )
+
+    result = agent.validate(output)
+
+    assert result.is_valid is False
+    assert result.errors == ["Missing deployment ID", "Missing project ID"]
+    assert result.warnings == [
+        "Deployment URL should start with http:// or https://",
+        "Deployment health check did not pass",
+    ]
+
+
+def test_health_check_window_tracks_recent_success_rate():
+    window = _HealthCheckWindow(size=4)
+    assert window.success_rate() == 0.0
+
+    for passed in (True, False, True, True):
+        window.record(passed)
+    assert window.success_rate() == 0.75
+
+    window.record(True)  # overwrites the oldest outcome (True)
+    window.record(True)  # overwrites the failed one
+    assert window.success_rate() == 1.0
+
+
+def test_vercel_config_json_is_cached_and_read_only():
+    config = get_vercel_config_json(Framework.REACT)
+
+    assert get_vercel_config_json(Framework.REACT) is config
+    assert config["outputDirectory"] == "dist"
+    with pytest.raises(TypeError):
+        config["outputDirectory"] = "build"
+
+
+def test_vercel_config_json_bytes_match_mapping():
+    content = get_vercel_config_json_bytes(Framework.SVELTE)
+
+    assert get_vercel_config_json_bytes(Framework.SVELTE) is content
+    assert orjson.loads(content) == orjson.loads(
+        orjson.dumps(get_vercel_config_json(Framework.SVELTE), default=dict)
+    )
+    assert content.startswith(b'{\n  "routes"')
+
+
+def test_framework_config_is_frozen_and_keeps_enum():
+    config = get_framework_config(Framework.VUE)
+
+    assert config.framework is Framework.VUE
+    assert config.required_files == ("package.json", "index.html")
+    with pytest.raises(FrozenInstanceError):
+        config.build_command = "vite build"
+    with pytest.raises(TypeError):
+        config.vercel_config["headers"][0]["source"] = "/api/(.*)"
+    with pytest.raises(TypeError):
+        config.environment_variables["NODE_ENV"] = "development"
+
+
+def test_is_spa_route_matches_extensionless_paths():
+    assert is_spa_route("/about/team", Framework.REACT) is True
+    assert is_spa_route("/assets/app.js", Framework.REACT) is False
+    assert is_spa_route("/about", Framework.NEXTJS) is False
+    assert is_spa_route("/about", Framework.VANILLA) is False
@@ -0,0 +1,41 @@
+import pytest
+from dataclasses import FrozenInstanceError
+from agents.design_styles import DesignStyleLibrary
+
+
+def test_styles_are_built_on_first_use():
+    library = DesignStyleLibrary()
+
+    assert library.styles == {}
+    assert "Retro/Nostalgic" in library.list_styles()
+
+    style = library.get_style("Retro/Nostalgic")
+
+    assert style.name == "Retro/Nostalgic"
+    assert library.get_style("retro-nostalgic") is style
+    assert list(library.styles) == ["retro_nostalgic"]
+
+
+def test_unknown_style_falls_back_to_bold_minimalism():
+    library = DesignStyleLibrary()
+
+    assert library.get_style("unknown").name == "Bold Minimalism"
+    assert "Use a minimal color palette" in library.get_style_prompt_addition("unknown")
+
+
+def test_styles_are_immutable():
+    style = DesignStyleLibrary().get_style("brutalism")
+
+    with pytest.raises(FrozenInstanceError):
+        style.name = "Changed"
+
+
+def test_tailwind_config_is_read_only():
+    library = DesignStyleLibrary()
+    config = library.get_tailwind_config("brutalism")
+
+    with pytest.raises(TypeError):
+        config["colors"]["primary"] = "#ffffff"
+
+    assert library.get_tailwind_config("brutalism") is config
+    assert DesignStyleLibrary().get_tailwind_config("brutalism")["colors"]["primary"] == "#000000"
@@ -38,6 +38,7 @@ class Settings(BaseSettings):
     
     # Vercel Deployment
     VERCEL_API_TOKEN: str = ""
+    STRICT_HTML_VALIDATION: bool = False  # Parse HTML with a real parser before deployment
     
     # Security
     SECRET_KEY: str
@@ -0,0 +1,25 @@
+"""
+Helpers for sharing module-level constants safely.
+"""
+from typing import Any
+from types import MappingProxyType
+
+
+def freeze(value: Any) -> Any:
+    """
+    Convert nested dicts and lists into read-only mapping proxies and tuples.
+    
+    Values that are already frozen are returned as-is, so constants built from
+    other frozen constants keep sharing them.
+    """
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        items = tuple(freeze(item) for item in value)
+        # Reuse tuples whose items were already frozen so shared constants stay shared
+        if isinstance(value, tuple) and all(new is old for new, old in zip(items, value)):
+            return value
+        return items
+    return value
@@ -3,7 +3,7 @@ Logging configuration for structured logging.
 """
 import logging
 import sys
-import json
+import orjson
 from datetime import datetime
 from typing import Any, Dict
 from utils.config import settings
@@ -33,7 +33,8 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "metadata"):
             log_data["metadata"] = record.metadata
         
-        return json.dumps(log_data)
+        # orjson serializes in C; fall back to str() for values it cannot encode
+        return orjson.dumps(log_data, default=str).decode()
 
 
 class StandardFormatter(logging.Formatter):